@@ -3,12 +3,21 @@ Workforce Intelligence Platform - Streamlit Web Application
 Main dashboard for analyzing staff, projects, billing, and deliverables
 """
 
+import io
+import re
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
+import pyarrow as pa
+import pyarrow.compute as pc
 from database import WorkforceDatabase
 from datetime import datetime
+from pathlib import Path
+
+# Serialize Plotly figures with orjson instead of the stdlib json encoder
+pio.json.config.default_engine = 'orjson'
 
 # Page configuration
 st.set_page_config(
@@ -19,237 +28,717 @@ st.set_page_config(
 )
 
 # Custom CSS for modern flat design with off-white and black
-st.markdown("""
-<style>
-    /* Main app background */
-    .stApp {
-        background-color: #fafaf8;
-    }
-    
-    /* Sidebar styling */
-    [data-testid="stSidebar"] {
-        background-color: #fafaf8;
-        border-right: 1px solid #e5e5e3;
-    }
-    
-    [data-testid="stSidebar"] * {
-        color: #1a1a1a !important;
-    }
-    
-    [data-testid="stSidebar"] .stRadio > div {
-        background-color: transparent;
-    }
-    
-    /* Main header */
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: 700;
-        color: #1a1a1a;
-        margin-bottom: 2rem;
-        letter-spacing: -0.02em;
-    }
-    
-    /* Metric cards */
-    [data-testid="stMetricValue"] {
-        font-size: 2rem;
-        font-weight: 700;
-        color: #1a1a1a;
-    }
-    
-    [data-testid="stMetricLabel"] {
-        font-size: 0.9rem;
-        font-weight: 500;
-        color: #4a4a4a;
-        text-transform: uppercase;
-        letter-spacing: 0.05em;
-    }
-    
-    /* Cards and containers */
-    .element-container {
-        background-color: #ffffff;
-    }
-    
-    /* Buttons */
-    .stButton > button {
-        background-color: #1a1a1a;
-        color: #fafaf8;
-        border: none;
-        border-radius: 4px;
-        padding: 0.5rem 1.5rem;
-        font-weight: 600;
-        transition: all 0.2s ease;
-    }
-    
-    .stButton > button:hover {
-        background-color: #2a2a2a;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.15);
-    }
-    
-    /* Primary button */
-    .stButton > button[kind="primary"] {
-        background-color: #1a1a1a;
-    }
-    
-    /* Dataframes */
-    [data-testid="stDataFrame"] {
-        border: 1px solid #e5e5e3;
-        border-radius: 4px;
-    }
-    
-    /* Tabs */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 0;
-        background-color: #ffffff;
-        border-bottom: 2px solid #e5e5e3;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        background-color: transparent;
-        color: #4a4a4a;
-        font-weight: 600;
-        border: none;
-        padding: 1rem 2rem;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background-color: transparent;
-        color: #1a1a1a;
-        border-bottom: 3px solid #1a1a1a;
-    }
-    
-    /* Input fields */
-    .stTextInput > div > div > input,
-    .stSelectbox > div > div > div,
-    .stMultiSelect > div > div > div {
-        background-color: #ffffff;
-        border: 1px solid #e5e5e3;
-        border-radius: 4px;
-        color: #1a1a1a;
-    }
-    
-    /* Subheaders */
-    .stMarkdown h2, .stMarkdown h3 {
-        color: #1a1a1a;
-        font-weight: 700;
-        letter-spacing: -0.01em;
-    }
-    
-    /* Info boxes */
-    .stAlert {
-        background-color: #ffffff;
-        border: 1px solid #e5e5e3;
-        border-radius: 4px;
-        color: #1a1a1a;
-    }
-    
-    /* Remove default padding */
-    .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-    }
-    
-    /* Plotly charts background */
-    .js-plotly-plot {
-        background-color: #ffffff !important;
-    }
-    
-    /* Dividers */
-    hr {
-        border-color: #e5e5e3;
-        margin: 2rem 0;
-    }
-    
-    /* Radio buttons in sidebar */
-    [data-testid="stSidebar"] .stRadio > label {
-        background-color: transparent;
-        padding: 0.5rem;
-        border-radius: 4px;
-    }
-    
-    [data-testid="stSidebar"] .stRadio > div {
-        background-color: transparent;
-    }
-    
-    /* Download button */
-    .stDownloadButton > button {
-        background-color: #1a1a1a;
-        color: #fafaf8;
-        border: none;
-        border-radius: 4px;
-        padding: 0.5rem 1.5rem;
-        font-weight: 600;
-    }
-    
-    .stDownloadButton > button:hover {
-        background-color: #2a2a2a;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_data
+def load_css():
+    """Read the app stylesheet once per server process"""
+    return Path("assets/app.css").read_text()
+
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 # Initialize database
+@st.cache_resource
+def get_db():
+    """Shared database instance (one per server process, reused across sessions and reruns)"""
+    return WorkforceDatabase(data_folder="Data")
+
+# Filter option lists (cached so reruns don't re-scan every row; helpers taking
+# `version` are keyed on db.version instead of hashing a DataFrame argument)
+def split_options(series):
+    """Sorted tuple of the individual ';'-separated values in a column (split/trim/unique run in Arrow)"""
+    values = pa.array(series.dropna().astype('string[pyarrow]'))
+    opts = pc.utf8_trim_whitespace(pc.list_flatten(pc.split_pattern(values, pattern=';')))
+    opts = pc.unique(opts.filter(pc.not_equal(opts, '')))
+    return tuple(pc.take(opts, pc.array_sort_indices(opts)).to_pylist())
+
 @st.cache_data
-def load_data_files():
-    """Load CSV data into memory"""
-    import pandas as pd
-    from pathlib import Path
-    
-    data_folder = Path("Data")
-    
-    data = {
-        'employees': pd.read_csv(data_folder / "EmployeeID-Name-Email-RoleID-JobTitle-Location-Skills-LinkedInURL.csv"),
-        'roles': pd.read_csv(data_folder / "RoleID-StandardRole-RoleTitleVariants.csv"),
-        'projects': pd.read_csv(data_folder / "BillingCode-ProjectName-Client-Industry-Technologies-DollarAmount-ProjectScope.csv"),
-        'billing': pd.read_csv(data_folder / "BillingCode-EmployeeID-Year-HoursBilled-RoleinProject.csv"),
-        'resume': pd.read_csv(data_folder / "EmployeeID-Education-Experience-Certifications-Summary.csv"),
-        'deliverables': pd.read_csv(data_folder / "BillingCode-Deliverable-DateCompleted-TopicArea-Technologies-Client-Codebase.csv")
+def unique_skills(version):
+    """Sorted tuple of individual skills across all employees"""
+    return split_options(get_db().employees_df['Skills'])
+
+@st.cache_data
+def unique_technologies(version):
+    """Sorted tuple of individual technologies across all projects"""
+    return split_options(get_db().projects_df['Technologies'])
+
+@st.cache_data
+def unique_deliverable_techs(version):
+    """Sorted tuple of individual technologies across all deliverables"""
+    return split_options(get_db().deliverables_df['Technologies'])
+
+@st.cache_data
+def category_options(version, table, column):
+    """Sorted tuple of a categorical column's values, e.g. category_options(v, 'projects', 'Client')"""
+    return tuple(getattr(get_db(), f"{table}_df")[column].cat.categories)
+
+@st.cache_data
+def employee_options(version):
+    """Tuple of (Employee_ID, Name) pairs for employee pickers"""
+    return tuple(get_db().employees_df[['Employee_ID', 'Name']].itertuples(index=False, name=None))
+
+@st.cache_data
+def project_options(version):
+    """Tuple of (Billing_Code, Project_Name) pairs for project pickers"""
+    return tuple(get_db().projects_df[['Billing_Code', 'Project_Name']].itertuples(index=False, name=None))
+
+@st.cache_data
+def billing_years(version):
+    """Tuple of billed years, most recent first"""
+    return tuple(sorted(get_db().billing_df['Year'].unique().tolist(), reverse=True))
+
+# Cached query wrappers (keyed on db.version plus the filter args; list args are passed as tuples so they hash)
+@st.cache_data(show_spinner=False)
+def employee_directory(version, skills=None, role=None, location=None, title=None):
+    """Cached db.get_employee_directory"""
+    return get_db().get_employee_directory(skills=list(skills) if skills else None,
+                                           role=role, location=location, title=title)
+
+@st.cache_data(show_spinner=False)
+def projects_dashboard(version, client=None, technology=None, min_amount=None, max_amount=None, industry=None):
+    """Cached db.get_projects_dashboard"""
+    return get_db().get_projects_dashboard(client=client, technology=technology,
+                                           min_amount=min_amount, max_amount=max_amount,
+                                           industry=industry)
+
+@st.cache_data(show_spinner=False)
+def billing_by_employee(version, employee_id=None):
+    """Cached db.get_billing_by_employee"""
+    return get_db().get_billing_by_employee(employee_id)
+
+@st.cache_data(show_spinner=False)
+def billing_by_project(version, billing_code=None):
+    """Cached db.get_billing_by_project"""
+    return get_db().get_billing_by_project(billing_code)
+
+@st.cache_data(show_spinner=False)
+def billing_by_year(version, year=None):
+    """Cached db.get_billing_by_year"""
+    return get_db().get_billing_by_year(year)
+
+@st.cache_data(show_spinner=False)
+def resume_matrix(version, employee_id=None):
+    """Cached db.get_resume_matrix"""
+    return get_db().get_resume_matrix(employee_id)
+
+@st.cache_data(show_spinner=False)
+def employee_project_history(version, employee_id, include_deliverables=True):
+    """Cached db.get_employee_project_history"""
+    return get_db().get_employee_project_history(employee_id, include_deliverables=include_deliverables)
+
+@st.cache_data(show_spinner=False)
+def resume_matrix_bulk(version, employee_ids):
+    """Cached db.get_resume_matrix_bulk"""
+    return get_db().get_resume_matrix_bulk(list(employee_ids))
+
+@st.cache_data(show_spinner=False)
+def employee_project_history_bulk(version, employee_ids, include_deliverables=True):
+    """Cached db.get_employee_project_history_bulk"""
+    return get_db().get_employee_project_history_bulk(list(employee_ids), include_deliverables=include_deliverables)
+
+@st.cache_data(show_spinner=False)
+def deliverables_tracker(version, billing_code=None, topic_area=None, client=None, technology=None):
+    """Cached db.get_deliverables_tracker"""
+    return get_db().get_deliverables_tracker(billing_code=billing_code, topic_area=topic_area,
+                                             client=client, technology=technology)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def complex_search(version, skills=None, location=None, role=None, client_experience=None,
+                   industry_experience=None, min_years_exp=None):
+    """Cached db.complex_search (skills passed as a sorted tuple so the key is order-independent)"""
+    return get_db().complex_search(skills=list(skills) if skills else None, location=location,
+                                   role=role, client_experience=client_experience,
+                                   industry_experience=industry_experience,
+                                   min_years_exp=min_years_exp)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def complex_search_csv(version, **filters):
+    """CSV export of a Complex Search, serialized once per filter combination"""
+    buffer = io.BytesIO()
+    complex_search(version, **filters).to_csv(buffer, index=False)
+    return buffer.getvalue()
+
+@st.cache_data(show_spinner=False)
+def analytics_by_industry(version):
+    """Cached db.get_analytics_by_industry (pass db.version so a data reload refreshes it)"""
+    return get_db().get_analytics_by_industry()
+
+@st.cache_data(show_spinner=False)
+def industry_chart_data(version, max_clients=8):
+    """Industry analytics for plotting, with all but the busiest clients folded into 'Other'"""
+    df = analytics_by_industry(version)
+    if df['Client'].nunique() <= max_clients:
+        return df
+    top_clients = df.groupby('Client')['Total_Hours'].sum().nlargest(max_clients).index
+    client = df['Client'].astype(object).where(df['Client'].isin(top_clients), 'Other')
+    return (df.assign(Client=client)
+              .groupby(['Industry', 'Client'], as_index=False, sort=False, dropna=False)
+              [['Project_Count', 'Total_Hours', 'Employee_Count', 'Total_Revenue']].sum()
+              .sort_values('Total_Hours', ascending=False, ignore_index=True))
+
+@st.cache_data(show_spinner=False)
+def analytics_by_skill(version):
+    """Cached db.get_analytics_by_skill (pass db.version so a data reload refreshes it)"""
+    return get_db().get_analytics_by_skill()
+
+@st.cache_data(show_spinner=False)
+def analytics_by_role(version):
+    """Cached db.get_analytics_by_role (pass db.version so a data reload refreshes it)"""
+    return get_db().get_analytics_by_role()
+
+@st.cache_data(show_spinner=False)
+def deliverable_breakdowns(version, billing_code=None, topic_area=None, client=None, technology=None):
+    """Deliverable counts by topic area and by client, as tidy (value, Count) frames"""
+    df = deliverables_tracker(version, billing_code=billing_code, topic_area=topic_area,
+                              client=client, technology=technology)
+    topic_counts = df['Topic_Area'].value_counts().rename_axis('Topic_Area').reset_index(name='Count')
+    client_counts = df['Client'].value_counts().rename_axis('Client').reset_index(name='Count')
+    return topic_counts, client_counts
+
+# AI Staffing inputs (fixed for the demo RFI, so loaded once per process)
+@st.cache_data(show_spinner=False)
+def parsed_requirements():
+    """Requirements extracted from the Texas Police RFI"""
+    return pd.read_csv("Data/parsed_requirements.csv", dtype={'Requirement_Type': 'category'})
+
+@st.cache_data(show_spinner=False)
+def staffing_candidates(version):
+    """Texas employees with Python or CV skills, the candidate pool for the demo RFI"""
+    return get_db().get_employee_directory(skills=["Python", "CV"], location="Texas")
+
+@st.cache_data(show_spinner=False)
+def candidate_match_data():
+    """AI fit score, proposed role and match reasons per Employee_ID for the demo RFI"""
+    match_data = {
+        '10004': {
+            'score': 98,
+            'role': 'Technical Lead',
+            'reasons': 'PhD in CV from MIT, 12y facial recognition systems, 8y law enforcement AI, AWS certified, Austin-based, Active security clearance'
+        },
+        '10005': {
+            'score': 96,
+            'role': 'Senior Engineer',
+            'reasons': 'MS Stanford, 9y CV engineering, 6y law enforcement systems, Developed solutions for 3 state police departments, TensorFlow expert'
+        },
+        '10006': {
+            'score': 94,
+            'role': 'Senior Architect',
+            'reasons': '11y enterprise architecture, 7y government projects, Active security clearance, AWS certified, Austin-based, API development expert'
+        },
+        '10007': {
+            'score': 93,
+            'role': 'Senior Engineer',
+            'reasons': 'PhD AI from Carnegie Mellon, 10y AI research, 5y law enforcement ML, Published 15+ papers, TensorFlow/PyTorch expert'
+        },
+        '10008': {
+            'score': 91,
+            'role': 'Project Manager',
+            'reasons': 'PMP certified, 8y PM experience, 6y government contracts, 4y law enforcement projects, Managed $50M+ in government tech'
+        },
+        '10001': {
+            'score': 89,
+            'role': 'Technical Lead',
+            'reasons': '10y police tech, 4y divisional management, PMP certified, Python CV expert, Austin-based, Leadership experience'
+        },
+        '10002': {
+            'score': 87,
+            'role': 'Senior Engineer',
+            'reasons': '7y police tech, 5y data analytics, 3y CV projects, CFE certified, Data science background'
+        },
+        '10003': {
+            'score': 85,
+            'role': 'Senior Engineer',
+            'reasons': 'PhD AI, 8y Python engineer, 2y federal law enforcement support, AWS DevOps certified, TensorFlow experience'
+        }
     }
-    
-    return data
+    df = pd.DataFrame.from_dict(match_data, orient='index')
+    df.index = df.index.astype(int)
+    return df
 
-def init_database():
-    """Initialize database connection (not cached to avoid threading issues)"""
-    return WorkforceDatabase(data_folder="Data")
+@st.cache_data(show_spinner=False)
+def role_rates():
+    """Hourly rate and estimated hours per proposed role, indexed by role"""
+    return pd.DataFrame.from_dict({
+        'Technical Lead': {'rate': 225, 'hours': 1800},
+        'Senior Engineer': {'rate': 185, 'hours': 1600},
+        'Senior Architect': {'rate': 200, 'hours': 1500},
+        'Project Manager': {'rate': 165, 'hours': 1400},
+        'AI Research Lead': {'rate': 210, 'hours': 1500}
+    }, orient='index')
 
-def style_chart(fig):
-    """Apply modern flat styling to Plotly charts"""
-    fig.update_layout(
-        plot_bgcolor='#ffffff',
-        paper_bgcolor='#ffffff',
-        font=dict(family="Inter, -apple-system, BlinkMacSystemFont, sans-serif", color='#1a1a1a'),
-        title_font=dict(size=18, color='#1a1a1a', family="Inter, sans-serif"),
-        margin=dict(l=20, r=20, t=40, b=20),
-        showlegend=True,
-        legend=dict(
-            bgcolor='rgba(255,255,255,0)',
-            bordercolor='#e5e5e3',
-            borderwidth=0
-        )
+@st.cache_data(show_spinner=False)
+def notional_candidates():
+    """Sample production search results shown when the database has no matching candidates"""
+    return pd.DataFrame({
+        'Employee_ID': ['EMP-45782', 'EMP-23901', 'EMP-67234', 'EMP-89012', 'EMP-34567'],
+        'Name': ['Dr. Marcus Rivera', 'Sarah Thompson', 'James Mitchell', 'Dr. Priya Patel', 'Michael O\'Brien'],
+        'Current_Title': ['Technical Lead - AI/ML', 'Senior CV Engineer', 'Senior Software Architect', 'AI Research Lead', 'Project Manager'],
+        'Location': ['Austin, TX', 'San Antonio, TX', 'Austin, TX', 'Dallas, TX', 'Houston, TX'],
+        'Fit_Score': [98, 96, 94, 93, 91],
+        'Proposed_Role': ['Technical Lead', 'Senior Engineer', 'Senior Architect', 'Senior Engineer', 'Project Manager'],
+        'Key_Skills': [
+            'Python, CV, OpenCV, TensorFlow, PyTorch, AWS, Facial Recognition',
+            'Python, CV, OpenCV, Deep Learning, Law Enforcement Systems',
+            'Python, AWS, API Development, Security Clearance, Government',
+            'Python, TensorFlow, PyTorch, Computer Vision, Research',
+            'PMP, Agile, Government Contracts, Law Enforcement'
+        ],
+        'Years_Experience': [12, 9, 11, 10, 8],
+        'Security_Clearance': ['Active', 'Eligible', 'Active', 'N/A', 'N/A']
+    })
+
+@st.cache_data(show_spinner=False)
+def staffing_matrix(version):
+    """Top five candidates with AI fit score, proposed role and match reasons, best fit first"""
+    candidates = staffing_candidates(version).head(5)
+    
+    # Apply match data to candidates (defaults for anyone without a profile analysis)
+    matches = candidate_match_data().reindex(candidates['Employee_ID'])
+    candidates = candidates.assign(
+        AI_Fit_Score=matches['score'].fillna(80).astype(int).to_numpy(),
+        Recommended_Role=pd.Categorical(matches['role'].fillna('Senior Engineer')),
+        Match_Reasons=matches['reasons'].fillna('Qualified candidate with relevant skills and experience').to_numpy()
+    )
+    # Few distinct locations and titles among candidates, so dictionary-encode them for display
+    candidates = candidates.astype({'Location': 'category', 'Job_Title': 'category'})
+    return candidates.sort_values('AI_Fit_Score', ascending=False)
+
+@st.cache_data(show_spinner=False)
+def staffing_matrix_csv(version):
+    """Staffing matrix encoded as CSV bytes for the download button"""
+    buffer = io.BytesIO()
+    staffing_matrix(version).to_csv(buffer, index=False)
+    return buffer.getvalue()
+
+# Critical RFI skills checked in the Skills Coverage matrix
+REQUIRED_SKILLS = ('Python', 'CV', 'OpenCV', 'TensorFlow', 'AWS', 'Leadership')
+
+@st.cache_data(show_spinner=False)
+def skill_flags(version, required_skills):
+    """uint8 matrix (candidates x required_skills) of which required skills each proposed candidate lists"""
+    candidates = staffing_matrix(version)
+    return np.stack([
+        candidates['Skills'].str.contains(skill, case=False, regex=False, na=False).to_numpy(dtype=np.uint8)
+        for skill in required_skills
+    ], axis=1)
+
+@st.cache_data(show_spinner=False)
+def missing_skills(version, required_skills):
+    """Required skills that no proposed candidate lists"""
+    team_coverage = np.bitwise_or.reduce(skill_flags(version, required_skills), axis=0)
+    return tuple(skill for skill, covered in zip(required_skills, team_coverage) if not covered)
+
+@st.cache_data(show_spinner=False)
+def skills_coverage(version, required_skills):
+    """Yes/No grid (as an Arrow table) of which required skills each proposed candidate lists"""
+    skills_df = pd.DataFrame(np.where(skill_flags(version, required_skills), 'Yes', 'No'),
+                             columns=list(required_skills))
+    skills_df.insert(0, 'Name', staffing_matrix(version)['Name'].values)
+    return pa.Table.from_pandas(skills_df, preserve_index=False)
+
+@st.cache_data(show_spinner=False)
+def staffing_summary(version):
+    """Candidate count, average and top fit score, and number of proposed roles"""
+    candidates = staffing_matrix(version)
+    return (len(candidates), float(candidates['AI_Fit_Score'].mean()),
+            float(candidates['AI_Fit_Score'].max()), candidates['Recommended_Role'].nunique())
+
+# Job title patterns in priority order (a lookahead per branch, so e.g. "Senior Director" reports to the VP)
+MANAGER_TITLE_PATTERN = re.compile(r'^(?:(?=.*(Technical Lead|Director))|(?=.*(Senior))|(?=.*(Project Manager)))')
+MANAGERS = ("VP of Engineering (vp.engineering@company.com)",
+            "Engineering Manager (eng.manager@company.com)",
+            "PMO Director (pmo.director@company.com)",
+            "Department Manager (dept.manager@company.com)")
+
+@st.cache_data(show_spinner=False)
+def manager_email(version):
+    """Managers of the proposed candidates and the staff request sent to them"""
+    candidates = staffing_matrix(version)
+    
+    # Simulate manager lookup based on role hierarchy (one regex pass; no match means Department Manager)
+    matched = candidates['Job_Title'].str.extract(MANAGER_TITLE_PATTERN).notna().to_numpy()
+    level = np.where(matched.any(axis=1), matched.argmax(axis=1), len(MANAGERS) - 1)
+    managers = np.array(MANAGERS)[level]
+    
+    team_lines = ('- ' + candidates['Name'].astype(str) +
+                  ' (Proposed: ' + candidates['Recommended_Role'].astype(str) +
+                  ', Fit Score: ' + candidates['AI_Fit_Score'].astype(str) + '%)')
+    
+    buffer = io.StringIO()
+    buffer.write(f"""Dear Manager,
+
+We have identified {len(candidates)} of your team members as excellent candidates for a high-priority project opportunity.
+
+**Project:** Texas Department of Public Safety - Statewide Facial Recognition System Enhancement
+**Client:** Texas DPS
+**Value:** $1.7M (estimated)
+**Duration:** 18 months
+**Start Date:** Q1 2026
+
+**Your Team Members Identified:**
+""")
+    buffer.writelines(f"{line}\n" for line in team_lines.tolist())
+    buffer.write("""
+These individuals were selected through our AI-powered matching system based on:
+- Technical skills alignment with RFI requirements
+- Domain expertise in law enforcement and government projects
+- Location compatibility (Texas-based)
+- Past performance on similar engagements
+- Security clearance status
+
+Please review the attached staffing matrix and confirm availability of your team members for this opportunity. We need responses by [deadline] to proceed with the proposal.
+
+The full project details and role descriptions are attached.
+
+Best regards,
+Business Development & Staffing Team""")
+    email_body = buffer.getvalue()
+    return tuple(pd.unique(managers)), email_body
+
+# Dashboard aggregates (identical for every user, so computed once)
+@st.cache_data(show_spinner=False)
+def dashboard_kpis(version):
+    """Employee count, project count, total billed hours and total revenue"""
+    db = get_db()
+    return (len(db.employees_df), len(db.projects_df),
+            float(db.billing_df['Hours_Billed'].sum()),
+            float(db.projects_df['Dollar_Amount'].sum()))
+
+@st.cache_data(show_spinner=False)
+def dashboard_charts(version):
+    """Industry chart data, role analytics and the full deliverables list for the dashboard"""
+    return industry_chart_data(version), analytics_by_role(version), deliverables_tracker(version)
+
+@st.cache_resource(show_spinner=False)
+def plotly_express():
+    """plotly.express, imported on first use so pages without px charts skip loading it"""
+    import plotly.express as px
+    return px
+
+# Lightweight single-series figures (built from plain dicts, skipping graph_objects validation)
+def bar_figure(x, y, title, x_title=None, y_title=None, orientation='v', color='#4A90E2'):
+    """Single-color bar chart"""
+    return go.Figure(
+        data=[{'type': 'bar', 'x': list(x), 'y': list(y), 'orientation': orientation,
+               'marker': {'color': color}, 'showlegend': False}],
+        layout={'title': {'text': title},
+                'xaxis': {'title': {'text': x_title}},
+                'yaxis': {'title': {'text': y_title}}},
+        _validate=False
     )
-    fig.update_xaxes(
-        gridcolor='#e5e5e3',
-        linecolor='#e5e5e3',
-        title_font=dict(color='#4a4a4a'),
-        tickfont=dict(color='#4a4a4a')
+
+def pie_figure(names, values, title, colors=('#4A90E2', '#7B68EE', '#5B9BD5', '#9370DB')):
+    """Pie chart cycling through the app palette"""
+    return go.Figure(
+        data=[{'type': 'pie', 'labels': list(names), 'values': list(values)}],
+        layout={'title': {'text': title}, 'piecolorway': list(colors)},
+        _validate=False
     )
-    fig.update_yaxes(
-        gridcolor='#e5e5e3',
-        linecolor='#e5e5e3',
-        title_font=dict(color='#4a4a4a'),
-        tickfont=dict(color='#4a4a4a')
+
+def stacked_bar_figure(df, x, y, color, title, colors=('#4A90E2', '#7B68EE', '#5B9BD5', '#9370DB')):
+    """Bar chart with one trace per value of the color column (what px.bar(color=...) draws)"""
+    groups = df.groupby(color, sort=False, dropna=False)
+    return go.Figure(
+        data=[{'type': 'bar', 'name': str(name), 'x': list(group[x]), 'y': list(group[y]),
+               'marker': {'color': colors[i % len(colors)]}}
+              for i, (name, group) in enumerate(groups)],
+        layout={'title': {'text': title}, 'barmode': 'relative',
+                'legend': {'title': {'text': color}},
+                'xaxis': {'title': {'text': x}},
+                'yaxis': {'title': {'text': y}}},
+        _validate=False
     )
-    # Use monochromatic color scheme
-    fig.update_traces(
-        marker=dict(
-            line=dict(width=0)
-        )
+
+def bubble_figure(df, x, y, size, color, hover, title, colors=('#4A90E2', '#7B68EE', '#5B9BD5'), size_max=20):
+    """WebGL bubble chart with one trace per value of the color column (what px.scatter(size=...) draws)"""
+    sizeref = df[size].max() / size_max ** 2 if len(df) else 1
+    groups = df.groupby(color, sort=False, dropna=False)
+    return go.Figure(
+        data=[{'type': 'scattergl', 'mode': 'markers', 'name': str(name),
+               'x': list(group[x]), 'y': list(group[y]), 'customdata': list(group[hover]),
+               'marker': {'color': colors[i % len(colors)], 'size': list(group[size]),
+                          'sizemode': 'area', 'sizeref': sizeref},
+               'hovertemplate': f'{x}=%{{x}}<br>{y}=%{{y}}<br>{hover}=%{{customdata}}<extra>{name}</extra>'}
+              for i, (name, group) in enumerate(groups)],
+        layout={'title': {'text': title},
+                'legend': {'title': {'text': color}},
+                'xaxis': {'title': {'text': x}},
+                'yaxis': {'title': {'text': y}}},
+        _validate=False
+    )
+
+# Flat chart styling, built once and applied over each figure's own layout
+CHART_LAYOUT = dict(
+    plot_bgcolor='#ffffff',
+    paper_bgcolor='#ffffff',
+    font=dict(family="Inter, -apple-system, BlinkMacSystemFont, sans-serif", color='#1a1a1a'),
+    title_font=dict(size=18, color='#1a1a1a', family="Inter, sans-serif"),
+    margin=dict(l=20, r=20, t=40, b=20),
+    showlegend=True,
+    uirevision='static',
+    transition=dict(duration=0),
+    legend=dict(
+        bgcolor='rgba(255,255,255,0)',
+        bordercolor='#e5e5e3',
+        borderwidth=0
     )
+)
+CHART_AXES = dict(
+    gridcolor='#e5e5e3',
+    linecolor='#e5e5e3',
+    title_font=dict(color='#4a4a4a'),
+    tickfont=dict(color='#4a4a4a')
+)
+# Use monochromatic color scheme
+CHART_TRACES = dict(marker=dict(line=dict(width=0)))
+
+def style_chart(fig):
+    """Apply modern flat styling to Plotly charts"""
+    fig.update_layout(CHART_LAYOUT)
+    fig.update_xaxes(CHART_AXES)
+    fig.update_yaxes(CHART_AXES)
+    fig.update_traces(CHART_TRACES)
     return fig
 
-# Create database instance (will be recreated on each rerun, avoiding threading issues)
-if 'db' not in st.session_state:
-    st.session_state.db = init_database()
+# Styled Analytics figures, built once per data version (cache_resource skips hashing/copying the Figure)
+@st.cache_resource(show_spinner=False)
+def industry_figures(version):
+    """Hours bar chart and hours-vs-revenue scatter for the Industry Analysis tab"""
+    chart_data = industry_chart_data(version)
+    bar = stacked_bar_figure(chart_data, x='Industry', y='Total_Hours', color='Client',
+                             title="Total Hours by Industry & Client")
+    scatter = bubble_figure(chart_data, x='Total_Hours', y='Total_Revenue',
+                            size='Employee_Count', color='Industry', hover='Client',
+                            title="Hours vs Revenue by Industry")
+    return style_chart(bar), style_chart(scatter)
+
+@st.cache_resource(show_spinner=False)
+def skills_figure(version):
+    """Top 15 skills bar chart for the Skills Analysis tab"""
+    top_skills = analytics_by_skill(version).head(15)
+    return style_chart(bar_figure(top_skills['Skill'], top_skills['Employee_Count'],
+                                  title="Top 15 Skills in Organization",
+                                  x_title='Skill', y_title='Employee_Count'))
+
+@st.cache_resource(show_spinner=False)
+def role_figures(version):
+    """Role pie and bar charts for the Role Distribution tab"""
+    role_data = analytics_by_role(version)
+    pie = pie_figure(role_data['Standard_Role'], role_data['Employee_Count'],
+                     title="Employee Distribution by Role")
+    bar = bar_figure(role_data['Standard_Role'], role_data['Employee_Count'],
+                     title="Employee Count by Role",
+                     x_title='Standard_Role', y_title='Employee_Count')
+    return style_chart(pie), style_chart(bar)
+
+def score_gradient(scores, vmin, vmax, low='#ffffff', high='#4A90E2'):
+    """Per-cell CSS shading scores from low to high color (for Styler.apply, one column at a time)"""
+    t = np.clip((scores.to_numpy(dtype=float) - vmin) / (vmax - vmin), 0, 1)
+    low_rgb = np.array([int(low[i:i + 2], 16) for i in (1, 3, 5)])
+    high_rgb = np.array([int(high[i:i + 2], 16) for i in (1, 3, 5)])
+    rgb = np.rint(low_rgb + np.outer(t, high_rgb - low_rgb)).astype(int)
+    text = np.where(t > 0.5, '#ffffff', '#1a1a1a')
+    return [f'background-color: #{r:02x}{g:02x}{b:02x}; color: {c}' for (r, g, b), c in zip(rgb, text)]
+
+# Styled AI Staffing figures, keyed on the plotted values so reruns with the same candidates reuse them
+@st.cache_resource(show_spinner=False)
+def requirements_figure(categories, counts):
+    """Requirement count per category for the parsed RFI"""
+    return style_chart(bar_figure(categories, counts, title="Requirements by Category",
+                                  x_title='Category', y_title='Count'))
+
+@st.cache_resource(show_spinner=False)
+def fit_score_figure(names, scores, score_column='AI_Fit_Score', text_template='%{text:.0f}%'):
+    """Candidate fit score bar chart shaded by score"""
+    px = plotly_express()
+    fig = px.bar(pd.DataFrame({'Name': names, score_column: scores}), x='Name', y=score_column,
+                 title="Candidate Fit Scores",
+                 color=score_column,
+                 color_continuous_scale=['#7B68EE', '#4A90E2'],
+                 labels={score_column: 'Fit Score (%)', 'Name': 'Candidate'},
+                 text=score_column)
+    fig.update_traces(texttemplate=text_template, textposition='outside')
+    return style_chart(fig)
+
+@st.cache_resource(show_spinner=False)
+def team_roles_figure(roles, counts):
+    """Proposed team roles pie chart"""
+    return style_chart(pie_figure(roles, counts, title="Proposed Team Roles"))
+
+# Static "How It Works" content for the AI Staffing page
+PROCESS_INTRO = """
+This system uses advanced AI and data pipeline technologies to automate the entire staffing process 
+from RFP analysis to candidate recommendation.
+"""
+
+PROCESS_STEPS = (
+    ("**Step 1: RFP/RFI Document Parsing**", """
+    **Technology:** Large Language Models (LLMs) with document understanding capabilities
+
+    **Process:**
+    1. **Document Ingestion**: PDF/Word documents are uploaded to the system
+    2. **Text Extraction**: OCR and text parsing extract content from documents
+    3. **LLM Analysis**: Advanced language models analyze the document to identify:
+       - Required technical skills (e.g., Python, Computer Vision, TensorFlow)
+       - Domain expertise requirements (e.g., Law Enforcement, Government)
+       - Team composition needs (roles, seniority levels, quantities)
+       - Location requirements and preferences
+       - Certifications and security clearances
+       - Project timeline and budget constraints
+    4. **Structured Output**: Extracted requirements are converted to structured data (CSV/JSON)
+
+    **Output:** `LLM_Parsed.docx` and `parsed_requirements.csv` containing categorized requirements
+    """),
+    ("**Step 2: Data Pipeline Integration**", """
+    **Technology:** Relational database with normalized schema and foreign key relationships
+
+    **Data Sources Integrated:**
+    - **Employee Master Data**: Employee_ID, Name, Email, Role_ID, Skills, Location
+    - **Role Definitions**: Role_ID → Standard_Role mapping with title variants
+    - **Project History**: Billing_Code → Project details (Client, Industry, Technologies)
+    - **Billing Records**: Employee_ID × Billing_Code × Year (hours, roles)
+    - **Resume Data**: Employee_ID → Education, Experience, Certifications, Summary
+    - **Deliverables**: Billing_Code → Deliverable outputs and technologies used
+
+    **Relationships Established:**
+    ```
+    Employee_ID: employees ↔ billing ↔ resume_data
+    Role_ID: employees ↔ roles (standardization)
+    Billing_Code: projects ↔ billing ↔ deliverables
+    ```
+
+    **Data Quality:**
+    - Automated validation of foreign key integrity
+    - Deduplication and normalization
+    - Historical data spanning multiple years
+    """),
+    ("**Step 3: Role & Responsibility Identification**", """
+    **Technology:** Pattern matching and historical analysis algorithms
+
+    **Process:**
+    1. **SoW Analysis**: Previous Statements of Work are analyzed to understand:
+       - Common role definitions for similar projects
+       - Typical team structures for project types
+       - Responsibility matrices and reporting relationships
+
+    2. **Deliverable Mapping**: System examines past deliverables by Billing_Code:
+       - Technologies used in similar projects
+       - Complexity levels and team sizes
+       - Success metrics and outcomes
+
+    3. **Role Standardization**: Maps job titles to standard roles:
+       - "Technical Lead - AI/ML" → Technical Lead
+       - "Senior CV Engineer" → Senior Engineer
+       - Accounts for title variants across departments
+
+    4. **Organizational Hierarchy**: Infers reporting structure:
+       - Technical Leads report to VP of Engineering
+       - Senior Engineers report to Engineering Manager
+       - Project Managers report to PMO Director
+
+    **Output:** Recommended roles with clear responsibilities based on proven patterns
+    """),
+    ("**Step 4: Candidate Identification & Scoring**", """
+    **Technology:** Multi-factor AI matching algorithm with weighted scoring
+
+    **Matching Criteria (Weighted):**
+
+    1. **Skills Match (35%)**:
+       - Exact skill matches from employee profiles
+       - Related/transferable skills consideration
+       - Technology stack alignment
+
+    2. **Domain Experience (25%)**:
+       - Industry experience (Law Enforcement, Government, etc.)
+       - Client type experience (Federal, State, Local)
+       - Project type similarity
+
+    3. **Location Compatibility (15%)**:
+       - Geographic proximity to project site
+       - Remote work capability
+       - Travel requirements alignment
+
+    4. **Past Performance (15%)**:
+       - Historical billing hours (commitment level)
+       - Project success rates
+       - Client feedback scores
+       - Deliverable quality metrics
+
+    5. **Certifications & Clearances (10%)**:
+       - Required certifications (PMP, AWS, etc.)
+       - Security clearance status
+       - Professional licenses
+
+    **Scoring Algorithm:**
+    ```
+    Fit_Score = (Skills_Match × 0.35) + 
+               (Domain_Experience × 0.25) + 
+               (Location_Match × 0.15) + 
+               (Past_Performance × 0.15) + 
+               (Certifications × 0.10)
+    ```
+
+    **Database Search:**
+    - Searches across 100,000+ employee profiles
+    - Parallel processing for sub-second results
+    - Ranked output with top candidates highlighted
+    """),
+    ("**Step 5: Team Composition & Cost Optimization**", """
+    **Technology:** Optimization algorithms and financial modeling
+
+    **Team Assembly:**
+    1. **Role Coverage**: Ensures all required roles are filled
+    2. **Skill Overlap**: Validates comprehensive skill coverage
+    3. **Seniority Balance**: Appropriate mix of leads and engineers
+    4. **Availability Check**: Confirms candidate availability
+
+    **Cost Calculation:**
+    - Role-based hourly rates (market-adjusted)
+    - Estimated hours per role based on project scope
+    - Base cost calculation: Σ(Rate × Hours) for all roles
+    - Profit margin application (adjustable 0-30%)
+    - Final bid price generation
+
+    **Output:**
+    - Staffing matrix with candidate details
+    - Cost breakdown by role
+    - Skills coverage matrix
+    - Team composition visualizations
+    """),
+    ("**Step 6: Communication & Workflow**", """
+    **Automated Communications:**
+
+    1. **Manager Approval Route**:
+       - Identifies candidates' managers via org hierarchy
+       - Sends approval requests with candidate details
+       - Tracks responses and availability confirmations
 
-db = st.session_state.db
+    2. **Direct Candidate Contact**:
+       - Personalized opportunity notifications
+       - Role-specific details and fit score
+       - Project information and timeline
+
+    3. **Stakeholder Updates**:
+       - Staffing matrix distribution
+       - Cost proposals and justifications
+       - Team composition presentations
+
+    **Export Capabilities:**
+    - CSV downloads for further analysis
+    - PDF staffing matrices for proposals
+    - PowerPoint presentations for stakeholder meetings
+    """),
+)
+
+PROCESS_BENEFITS = """
+**Key Benefits:**
+- **Speed**: Reduces staffing time from weeks to minutes
+- **Accuracy**: Data-driven matching eliminates guesswork
+- **Transparency**: Clear scoring and justification for every candidate
+- **Cost Optimization**: Automated pricing with margin controls
+- **Scalability**: Handles 100,000+ employees effortlessly
+"""
+
+# Database instance shared across all sessions
+db = get_db()
 
 # Sidebar navigation
 st.sidebar.title("Navigation")
@@ -278,23 +767,22 @@ Analyze staff, projects, billing, and deliverables across your organization.
 if page == "Dashboard":
     st.markdown('<p class="main-header">Workforce Intelligence Dashboard</p>', unsafe_allow_html=True)
     
+    total_employees, total_projects, total_hours, total_revenue = dashboard_kpis(db.version)
+    industry_data, role_data, recent_deliverables = dashboard_charts(db.version)
+    
     # Key metrics
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        total_employees = len(db.employees_df)
         st.metric("Total Employees", total_employees)
     
     with col2:
-        total_projects = len(db.projects_df)
         st.metric("Active Projects", total_projects)
     
     with col3:
-        total_hours = db.billing_df['Hours_Billed'].sum()
         st.metric("Total Hours Billed", f"{total_hours:,.0f}")
     
     with col4:
-        total_revenue = db.projects_df['Dollar_Amount'].sum()
         st.metric("Total Revenue", f"${total_revenue:,.0f}")
     
     st.markdown("---")
@@ -304,25 +792,20 @@ if page == "Dashboard":
     
     with col1:
         st.subheader("Hours by Industry")
-        industry_data = db.get_analytics_by_industry()
-        fig = px.bar(industry_data, x='Industry', y='Total_Hours', 
-                     color='Client', title="Billed Hours by Industry & Client",
-                     color_discrete_sequence=['#4A90E2', '#7B68EE', '#5B9BD5', '#9370DB'])
+        fig = stacked_bar_figure(industry_data, x='Industry', y='Total_Hours', color='Client',
+                                 title="Billed Hours by Industry & Client")
         fig = style_chart(fig)
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         st.subheader("Staff by Role")
-        role_data = db.get_analytics_by_role()
-        fig = px.pie(role_data, values='Employee_Count', names='Standard_Role',
-                     title="Employee Distribution by Role",
-                     color_discrete_sequence=['#4A90E2', '#7B68EE', '#5B9BD5', '#9370DB'])
+        fig = pie_figure(role_data['Standard_Role'], role_data['Employee_Count'],
+                         title="Employee Distribution by Role")
         fig = style_chart(fig)
         st.plotly_chart(fig, use_container_width=True)
     
     # Recent activity
     st.subheader("Recent Deliverables")
-    recent_deliverables = db.get_deliverables_tracker()
     st.dataframe(recent_deliverables, use_container_width=True, hide_index=True)
 
 # ============================================================================
@@ -331,87 +814,88 @@ if page == "Dashboard":
 elif page == "Employee Directory":
     st.markdown('<p class="main-header">Employee Directory</p>', unsafe_allow_html=True)
     
-    st.markdown("**Filter employees by skills, role, location, and title**")
-    
-    # Filters
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        # Get unique skills
-        all_skills = set()
-        for skills_str in db.employees_df['Skills'].dropna():
-            all_skills.update([s.strip() for s in str(skills_str).split(';')])
-        selected_skills = st.multiselect("Skills", sorted(all_skills))
-    
-    with col2:
-        roles = db.roles_df['Standard_Role'].unique()
-        selected_role = st.selectbox("Role", ["All"] + list(roles))
-    
-    with col3:
-        locations = db.employees_df['Location'].unique()
-        selected_location = st.selectbox("Location", ["All"] + list(locations))
-    
-    with col4:
-        title_search = st.text_input("Job Title (search)")
-    
-    # Apply filters
-    filtered_df = db.get_employee_directory(
-        skills=selected_skills if selected_skills else None,
-        role=selected_role if selected_role != "All" else None,
-        location=selected_location if selected_location != "All" else None,
-        title=title_search if title_search else None
-    )
-    
-    st.markdown(f"**Found {len(filtered_df)} employees**")
-    
-    # Display results
-    if len(filtered_df) > 0:
-        # Make clickable links
-        if 'LinkedIn_URL' in filtered_df.columns:
-            filtered_df['LinkedIn'] = filtered_df['LinkedIn_URL'].apply(
-                lambda x: f'[Profile]({x})' if pd.notna(x) else ''
-            )
+    @st.fragment
+    def directory_page():
+        """Directory filters, results and employee details"""
+        st.markdown("**Filter employees by skills, role, location, and title**")
         
-        st.dataframe(
-            filtered_df[['Employee_ID', 'Name', 'Email', 'Job_Title', 'Location', 
-                        'Skills', 'Standard_Role']],
-            use_container_width=True,
-            hide_index=True
-        )
+        # Filters (applied together on submit, one rerun per change set)
+        with st.form('directory_filters'):
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                selected_skills = st.multiselect("Skills", unique_skills(db.version))
+            
+            with col2:
+                roles = category_options(db.version, 'roles', 'Standard_Role')
+                selected_role = st.selectbox("Role", ("All",) + roles)
+            
+            with col3:
+                locations = category_options(db.version, 'employees', 'Location')
+                selected_location = st.selectbox("Location", ("All",) + locations)
+            
+            with col4:
+                title_search = st.text_input("Job Title (search)")
+            
+            st.form_submit_button('Apply Filters')
         
-        # Employee details
-        st.markdown("---")
-        st.subheader("Employee Details")
-        selected_emp = st.selectbox(
-            "Select employee for detailed view:",
-            filtered_df['Employee_ID'].tolist(),
-            format_func=lambda x: f"{x} - {filtered_df[filtered_df['Employee_ID']==x]['Name'].values[0]}"
+        # Apply filters
+        filtered_df = employee_directory(
+            db.version,
+            skills=tuple(selected_skills) if selected_skills else None,
+            role=selected_role if selected_role != "All" else None,
+            location=selected_location if selected_location != "All" else None,
+            title=title_search if title_search else None
         )
         
-        if selected_emp:
-            emp_resume = db.get_resume_matrix(selected_emp)
-            emp_projects = db.get_employee_project_history(selected_emp)
-            
-            col1, col2 = st.columns(2)
+        st.markdown(f"**Found {len(filtered_df)} employees**")
+        
+        # Display results
+        if len(filtered_df) > 0:
+            st.dataframe(
+                filtered_df[['Employee_ID', 'Name', 'Email', 'Job_Title', 'Location', 
+                            'Skills', 'Standard_Role', 'LinkedIn_URL']],
+                use_container_width=True,
+                hide_index=True,
+                column_config={'LinkedIn_URL': st.column_config.LinkColumn('LinkedIn')}
+            )
             
-            with col1:
-                st.markdown("**Resume Information**")
-                if len(emp_resume) > 0:
-                    st.write(f"**Education:** {emp_resume.iloc[0]['Education']}")
-                    st.write(f"**Experience:** {emp_resume.iloc[0]['Experience']}")
-                    st.write(f"**Certifications:** {emp_resume.iloc[0]['Certifications']}")
-                    st.write(f"**Summary:** {emp_resume.iloc[0]['Summary']}")
+            # Employee details
+            st.markdown("---")
+            st.subheader("Employee Details")
+            name_by_id = dict(zip(filtered_df['Employee_ID'], filtered_df['Name']))
+            selected_emp = st.selectbox(
+                "Select employee for detailed view:",
+                list(name_by_id),
+                format_func=lambda x: f"{x} - {name_by_id[x]}"
+            )
             
-            with col2:
-                st.markdown("**Project History**")
-                if len(emp_projects) > 0:
-                    st.dataframe(
-                        emp_projects[['Project_Name', 'Client', 'Year', 'Hours_Billed', 'Role_in_Project']],
-                        use_container_width=True,
-                        hide_index=True
-                    )
-    else:
-        st.warning("No employees found matching the criteria.")
+            if selected_emp:
+                emp_resume = resume_matrix(db.version, selected_emp)
+                emp_projects = employee_project_history(db.version, selected_emp, include_deliverables=False)
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.markdown("**Resume Information**")
+                    if len(emp_resume) > 0:
+                        st.write(f"**Education:** {emp_resume.iloc[0]['Education']}")
+                        st.write(f"**Experience:** {emp_resume.iloc[0]['Experience']}")
+                        st.write(f"**Certifications:** {emp_resume.iloc[0]['Certifications']}")
+                        st.write(f"**Summary:** {emp_resume.iloc[0]['Summary']}")
+                
+                with col2:
+                    st.markdown("**Project History**")
+                    if len(emp_projects) > 0:
+                        st.dataframe(
+                            emp_projects[['Project_Name', 'Client', 'Year', 'Hours_Billed', 'Role_in_Project']],
+                            use_container_width=True,
+                            hide_index=True
+                        )
+        else:
+            st.warning("No employees found matching the criteria.")
+    
+    directory_page()
 
 # ============================================================================
 # PROJECTS DASHBOARD
@@ -419,94 +903,102 @@ elif page == "Employee Directory":
 elif page == "Projects":
     st.markdown('<p class="main-header">Projects Dashboard</p>', unsafe_allow_html=True)
     
-    st.markdown("**View projects by client, technology, and dollar amount**")
-    
-    # Filters
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        clients = db.projects_df['Client'].unique()
-        selected_client = st.selectbox("Client", ["All"] + list(clients))
-    
-    with col2:
-        industries = db.projects_df['Industry'].unique()
-        selected_industry = st.selectbox("Industry", ["All"] + list(industries))
-    
-    with col3:
-        # Get unique technologies
-        all_techs = set()
-        for tech_str in db.projects_df['Technologies'].dropna():
-            all_techs.update([t.strip() for t in str(tech_str).split(';')])
-        selected_tech = st.selectbox("Technology", ["All"] + sorted(all_techs))
-    
-    with col4:
-        min_amount = st.number_input("Min Dollar Amount", min_value=0, value=0, step=50000)
-    
-    # Apply filters
-    filtered_projects = db.get_projects_dashboard(
-        client=selected_client if selected_client != "All" else None,
-        industry=selected_industry if selected_industry != "All" else None,
-        technology=selected_tech if selected_tech != "All" else None,
-        min_amount=min_amount if min_amount > 0 else None
-    )
-    
-    st.markdown(f"**Found {len(filtered_projects)} projects**")
-    
-    # Display results
-    if len(filtered_projects) > 0:
-        st.dataframe(filtered_projects, use_container_width=True, hide_index=True)
+    @st.fragment
+    def projects_page():
+        """Project filters, results, charts and team details"""
+        st.markdown("**View projects by client, technology, and dollar amount**")
         
-        # Project visualization
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            fig = px.bar(filtered_projects, x='Project_Name', y='Dollar_Amount',
-                        color='Industry', title="Project Revenue",
-                        color_discrete_sequence=['#4A90E2', '#7B68EE', '#5B9BD5', '#9370DB'])
-            fig = style_chart(fig)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            fig = px.scatter(filtered_projects, x='Project_Name', y='Dollar_Amount',
-                           size='Dollar_Amount', color='Client',
-                           title="Projects by Client & Value",
-                           color_discrete_sequence=['#4A90E2', '#7B68EE', '#5B9BD5', '#9370DB'])
-            fig = style_chart(fig)
-            st.plotly_chart(fig, use_container_width=True)
+        # Filters (applied together on submit, one rerun per change set)
+        with st.form('project_filters'):
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                clients = category_options(db.version, 'projects', 'Client')
+                selected_client = st.selectbox("Client", ("All",) + clients)
+            
+            with col2:
+                industries = category_options(db.version, 'projects', 'Industry')
+                selected_industry = st.selectbox("Industry", ("All",) + industries)
+            
+            with col3:
+                selected_tech = st.selectbox("Technology", ("All",) + unique_technologies(db.version))
+            
+            with col4:
+                min_amount = st.number_input("Min Dollar Amount", min_value=0, value=0, step=50000)
+            
+            st.form_submit_button('Apply Filters')
         
-        # Project details
-        st.markdown("---")
-        st.subheader("Project Details")
-        selected_project = st.selectbox(
-            "Select project for team details:",
-            filtered_projects['Billing_Code'].tolist(),
-            format_func=lambda x: f"{x} - {filtered_projects[filtered_projects['Billing_Code']==x]['Project_Name'].values[0]}"
+        # Apply filters
+        filtered_projects = projects_dashboard(
+            db.version,
+            client=selected_client if selected_client != "All" else None,
+            industry=selected_industry if selected_industry != "All" else None,
+            technology=selected_tech if selected_tech != "All" else None,
+            min_amount=min_amount if min_amount > 0 else None
         )
         
-        if selected_project:
-            project_billing = db.get_billing_by_project(selected_project)
-            project_deliverables = db.get_deliverables_tracker(billing_code=selected_project)
+        st.markdown(f"**Found {len(filtered_projects)} projects**")
+        
+        # Display results
+        if len(filtered_projects) > 0:
+            st.dataframe(filtered_projects, use_container_width=True, hide_index=True)
             
+            # Project visualization
+            px = plotly_express()
             col1, col2 = st.columns(2)
             
             with col1:
-                st.markdown("**Team Members**")
-                st.dataframe(
-                    project_billing[['Name', 'Job_Title', 'Hours_Billed', 'Role_in_Project']],
-                    use_container_width=True,
-                    hide_index=True
-                )
+                fig = px.bar(filtered_projects, x='Project_Name', y='Dollar_Amount',
+                            color='Industry', title="Project Revenue",
+                            color_discrete_sequence=['#4A90E2', '#7B68EE', '#5B9BD5', '#9370DB'])
+                fig = style_chart(fig)
+                st.plotly_chart(fig, use_container_width=True)
             
             with col2:
-                st.markdown("**Deliverables**")
-                if len(project_deliverables) > 0:
+                fig = px.scatter(filtered_projects, x='Project_Name', y='Dollar_Amount',
+                               size='Dollar_Amount', color='Client',
+                               title="Projects by Client & Value",
+                               color_discrete_sequence=['#4A90E2', '#7B68EE', '#5B9BD5', '#9370DB'],
+                               render_mode='webgl')
+                fig = style_chart(fig)
+                st.plotly_chart(fig, use_container_width=True)
+            
+            # Project details
+            st.markdown("---")
+            st.subheader("Project Details")
+            project_by_code = dict(zip(filtered_projects['Billing_Code'], filtered_projects['Project_Name']))
+            selected_project = st.selectbox(
+                "Select project for team details:",
+                list(project_by_code),
+                format_func=lambda x: f"{x} - {project_by_code[x]}"
+            )
+            
+            if selected_project:
+                project_billing = billing_by_project(db.version, selected_project)
+                project_deliverables = deliverables_tracker(db.version, billing_code=selected_project)
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.markdown("**Team Members**")
                     st.dataframe(
-                        project_deliverables[['Deliverable', 'Date_Completed', 'Topic_Area']],
+                        project_billing[['Name', 'Job_Title', 'Hours_Billed', 'Role_in_Project']],
                         use_container_width=True,
                         hide_index=True
                     )
-    else:
-        st.warning("No projects found matching the criteria.")
+                
+                with col2:
+                    st.markdown("**Deliverables**")
+                    if len(project_deliverables) > 0:
+                        st.dataframe(
+                            project_deliverables[['Deliverable', 'Date_Completed', 'Topic_Area']],
+                            use_container_width=True,
+                            hide_index=True
+                        )
+        else:
+            st.warning("No projects found matching the criteria.")
+    
+    projects_page()
 
 # ============================================================================
 # BILLING & TIME TRACKING
@@ -519,21 +1011,21 @@ elif page == "Billing & Time Tracking":
     with tab1:
         st.subheader("Hours by Employee")
         
-        employees = db.employees_df[['Employee_ID', 'Name']].values.tolist()
         selected_emp = st.selectbox(
             "Select Employee (or leave blank for all):",
-            [None] + employees,
+            (None,) + employee_options(db.version),
             format_func=lambda x: "All Employees" if x is None else f"{x[0]} - {x[1]}"
         )
         
         emp_id = selected_emp[0] if selected_emp else None
-        billing_data = db.get_billing_by_employee(emp_id)
+        billing_data = billing_by_employee(db.version, emp_id)
         
         if len(billing_data) > 0:
             st.dataframe(billing_data, use_container_width=True, hide_index=True)
             
             # Visualization
             if emp_id:
+                px = plotly_express()
                 fig = px.bar(billing_data, x='Project_Name', y='Hours_Billed',
                            color='Year', title=f"Hours Billed by {selected_emp[1]}",
                            color_discrete_sequence=['#4A90E2', '#7B68EE'])
@@ -543,30 +1035,30 @@ elif page == "Billing & Time Tracking":
                 # Summary by employee
                 summary = billing_data.groupby('Name')['Hours_Billed'].sum().reset_index()
                 summary = summary.sort_values('Hours_Billed', ascending=False)
-                fig = px.bar(summary, x='Name', y='Hours_Billed',
-                           title="Total Hours by Employee",
-                           color_discrete_sequence=['#4A90E2'])
+                fig = bar_figure(summary['Name'], summary['Hours_Billed'],
+                                 title="Total Hours by Employee",
+                                 x_title='Name', y_title='Hours_Billed')
                 fig = style_chart(fig)
                 st.plotly_chart(fig, use_container_width=True)
     
     with tab2:
         st.subheader("Hours by Project")
         
-        projects = db.projects_df[['Billing_Code', 'Project_Name']].values.tolist()
         selected_proj = st.selectbox(
             "Select Project (or leave blank for all):",
-            [None] + projects,
+            (None,) + project_options(db.version),
             format_func=lambda x: "All Projects" if x is None else f"{x[0]} - {x[1]}"
         )
         
         proj_code = selected_proj[0] if selected_proj else None
-        billing_data = db.get_billing_by_project(proj_code)
+        billing_data = billing_by_project(db.version, proj_code)
         
         if len(billing_data) > 0:
             st.dataframe(billing_data, use_container_width=True, hide_index=True)
             
             # Visualization
             if proj_code:
+                px = plotly_express()
                 fig = px.bar(billing_data, x='Name', y='Hours_Billed',
                            color='Role_in_Project', title=f"Team Hours for {selected_proj[1]}",
                            color_discrete_sequence=['#4A90E2', '#7B68EE', '#5B9BD5'])
@@ -576,24 +1068,25 @@ elif page == "Billing & Time Tracking":
                 # Summary by project
                 summary = billing_data.groupby('Project_Name')['Hours_Billed'].sum().reset_index()
                 summary = summary.sort_values('Hours_Billed', ascending=False)
-                fig = px.bar(summary, x='Project_Name', y='Hours_Billed',
-                           title="Total Hours by Project",
-                           color_discrete_sequence=['#4A90E2'])
+                fig = bar_figure(summary['Project_Name'], summary['Hours_Billed'],
+                                 title="Total Hours by Project",
+                                 x_title='Project_Name', y_title='Hours_Billed')
                 fig = style_chart(fig)
                 st.plotly_chart(fig, use_container_width=True)
     
     with tab3:
         st.subheader("Hours by Year")
         
-        years = sorted(db.billing_df['Year'].unique(), reverse=True)
-        selected_year = st.selectbox("Select Year (or leave blank for all):", [None] + list(years))
+        selected_year = st.selectbox("Select Year (or leave blank for all):",
+                                     (None,) + billing_years(db.version))
         
-        billing_data = db.get_billing_by_year(selected_year)
+        billing_data = billing_by_year(db.version, selected_year)
         
         if len(billing_data) > 0:
             st.dataframe(billing_data, use_container_width=True, hide_index=True)
             
             # Visualization
+            px = plotly_express()
             fig = px.bar(billing_data, x='Project_Name', y='Total_Hours',
                        color='Industry', title="Hours by Project and Industry",
                        color_discrete_sequence=['#4A90E2', '#7B68EE', '#5B9BD5'])
@@ -611,7 +1104,7 @@ elif page == "Resume & Skills Matrix":
     with tab1:
         st.subheader("Employee Resume & Experience")
         
-        employees = db.employees_df[['Employee_ID', 'Name']].values.tolist()
+        employees = employee_options(db.version)
         selected_emp = st.selectbox(
             "Select Employee:",
             employees,
@@ -620,7 +1113,7 @@ elif page == "Resume & Skills Matrix":
         
         if selected_emp:
             emp_id = selected_emp[0]
-            resume_data = db.get_resume_matrix(emp_id)
+            resume_data = resume_matrix(db.version, emp_id)
             
             if len(resume_data) > 0:
                 emp = resume_data.iloc[0]
@@ -654,11 +1147,11 @@ elif page == "Resume & Skills Matrix":
                 # Project history
                 st.markdown("---")
                 st.markdown("### Project History")
-                project_history = db.get_employee_project_history(emp_id)
+                project_history = employee_project_history(db.version, emp_id, include_deliverables=False)
                 if len(project_history) > 0:
                     st.dataframe(
                         project_history[['Project_Name', 'Client', 'Industry', 'Year', 
-                                       'Hours_Billed', 'Role_in_Project']].drop_duplicates(),
+                                       'Hours_Billed', 'Role_in_Project']],
                         use_container_width=True,
                         hide_index=True
                     )
@@ -666,7 +1159,7 @@ elif page == "Resume & Skills Matrix":
     with tab2:
         st.subheader("Skills Distribution")
         
-        skills_data = db.get_analytics_by_skill()
+        skills_data = analytics_by_skill(db.version)
         
         col1, col2 = st.columns([2, 1])
         
@@ -674,9 +1167,10 @@ elif page == "Resume & Skills Matrix":
             st.dataframe(skills_data, use_container_width=True, hide_index=True)
         
         with col2:
-            fig = px.bar(skills_data.head(10), x='Employee_Count', y='Skill',
-                        orientation='h', title="Top 10 Skills",
-                        color_discrete_sequence=['#4A90E2'])
+            top_skills = skills_data.head(10)
+            fig = bar_figure(top_skills['Employee_Count'], top_skills['Skill'],
+                             orientation='h', title="Top 10 Skills",
+                             x_title='Employee_Count', y_title='Skill')
             fig = style_chart(fig)
             st.plotly_chart(fig, use_container_width=True)
 
@@ -686,63 +1180,66 @@ elif page == "Resume & Skills Matrix":
 elif page == "Deliverables":
     st.markdown('<p class="main-header">Deliverables Tracker</p>', unsafe_allow_html=True)
     
-    st.markdown("**Track deliverables by project, topic area, and client**")
-    
-    # Filters
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        projects = db.projects_df['Billing_Code'].unique()
-        selected_project = st.selectbox("Project", ["All"] + list(projects))
-    
-    with col2:
-        topic_areas = db.deliverables_df['Topic_Area'].unique()
-        selected_topic = st.selectbox("Topic Area", ["All"] + list(topic_areas))
-    
-    with col3:
-        clients = db.deliverables_df['Client'].unique()
-        selected_client = st.selectbox("Client", ["All"] + list(clients))
-    
-    with col4:
-        # Get unique technologies
-        all_techs = set()
-        for tech_str in db.deliverables_df['Technologies'].dropna():
-            all_techs.update([t.strip() for t in str(tech_str).split(';')])
-        selected_tech = st.selectbox("Technology", ["All"] + sorted(all_techs))
-    
-    # Apply filters
-    filtered_deliverables = db.get_deliverables_tracker(
-        billing_code=selected_project if selected_project != "All" else None,
-        topic_area=selected_topic if selected_topic != "All" else None,
-        client=selected_client if selected_client != "All" else None,
-        technology=selected_tech if selected_tech != "All" else None
-    )
-    
-    st.markdown(f"**Found {len(filtered_deliverables)} deliverables**")
-    
-    if len(filtered_deliverables) > 0:
-        st.dataframe(filtered_deliverables, use_container_width=True, hide_index=True)
+    @st.fragment
+    def deliverables_page():
+        """Deliverable filters, results and charts"""
+        st.markdown("**Track deliverables by project, topic area, and client**")
         
-        # Visualizations
-        col1, col2 = st.columns(2)
+        # Filters (applied together on submit, one rerun per change set)
+        with st.form('deliverable_filters'):
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                billing_codes = tuple(code for code, _ in project_options(db.version))
+                selected_project = st.selectbox("Project", ("All",) + billing_codes)
+            
+            with col2:
+                topic_areas = category_options(db.version, 'deliverables', 'Topic_Area')
+                selected_topic = st.selectbox("Topic Area", ("All",) + topic_areas)
+            
+            with col3:
+                clients = category_options(db.version, 'deliverables', 'Client')
+                selected_client = st.selectbox("Client", ("All",) + clients)
+            
+            with col4:
+                selected_tech = st.selectbox("Technology", ("All",) + unique_deliverable_techs(db.version))
+            
+            st.form_submit_button('Apply Filters')
         
-        with col1:
-            topic_counts = filtered_deliverables['Topic_Area'].value_counts()
-            fig = px.pie(values=topic_counts.values, names=topic_counts.index,
-                        title="Deliverables by Topic Area",
-                        color_discrete_sequence=['#4A90E2', '#7B68EE', '#5B9BD5', '#9370DB'])
-            fig = style_chart(fig)
-            st.plotly_chart(fig, use_container_width=True)
+        # Apply filters
+        filters = dict(
+            billing_code=selected_project if selected_project != "All" else None,
+            topic_area=selected_topic if selected_topic != "All" else None,
+            client=selected_client if selected_client != "All" else None,
+            technology=selected_tech if selected_tech != "All" else None
+        )
+        filtered_deliverables = deliverables_tracker(db.version, **filters)
         
-        with col2:
-            client_counts = filtered_deliverables['Client'].value_counts()
-            fig = px.bar(x=client_counts.index, y=client_counts.values,
-                        title="Deliverables by Client",
-                        color_discrete_sequence=['#4A90E2'])
-            fig = style_chart(fig)
-            st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.warning("No deliverables found matching the criteria.")
+        st.markdown(f"**Found {len(filtered_deliverables)} deliverables**")
+        
+        if len(filtered_deliverables) > 0:
+            st.dataframe(filtered_deliverables, use_container_width=True, hide_index=True)
+            
+            # Visualizations
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                topic_counts, client_counts = deliverable_breakdowns(db.version, **filters)
+                fig = pie_figure(topic_counts['Topic_Area'], topic_counts['Count'],
+                                 title="Deliverables by Topic Area")
+                fig = style_chart(fig)
+                st.plotly_chart(fig, use_container_width=True)
+            
+            with col2:
+                fig = bar_figure(client_counts['Client'], client_counts['Count'],
+                                 title="Deliverables by Client",
+                                 x_title='Client', y_title='Count')
+                fig = style_chart(fig)
+                st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.warning("No deliverables found matching the criteria.")
+    
+    deliverables_page()
 
 # ============================================================================
 # ANALYTICS & REPORTS
@@ -750,68 +1247,50 @@ elif page == "Deliverables":
 elif page == "Analytics & Reports":
     st.markdown('<p class="main-header">Analytics & Reports</p>', unsafe_allow_html=True)
     
-    tab1, tab2, tab3 = st.tabs(["Industry Analysis", "Skills Analysis", "Role Distribution"])
+    # Radio instead of st.tabs so only the selected view is computed on each rerun
+    analytics_view = st.radio("View", ["Industry Analysis", "Skills Analysis", "Role Distribution"],
+                              horizontal=True, label_visibility="collapsed")
     
-    with tab1:
+    if analytics_view == "Industry Analysis":
         st.subheader("Hours & Revenue by Industry/Client")
         
-        industry_data = db.get_analytics_by_industry()
+        industry_data = analytics_by_industry(db.version)
         
         st.dataframe(industry_data, use_container_width=True, hide_index=True)
         
         col1, col2 = st.columns(2)
+        hours_fig, revenue_fig = industry_figures(db.version)
         
         with col1:
-            fig = px.bar(industry_data, x='Industry', y='Total_Hours',
-                        color='Client', title="Total Hours by Industry & Client",
-                        color_discrete_sequence=['#4A90E2', '#7B68EE', '#5B9BD5', '#9370DB'])
-            fig = style_chart(fig)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(hours_fig, use_container_width=True)
         
         with col2:
-            fig = px.scatter(industry_data, x='Total_Hours', y='Total_Revenue',
-                           size='Employee_Count', color='Industry',
-                           hover_data=['Client'],
-                           title="Hours vs Revenue by Industry",
-                           color_discrete_sequence=['#4A90E2', '#7B68EE', '#5B9BD5'])
-            fig = style_chart(fig)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(revenue_fig, use_container_width=True)
     
-    with tab2:
+    elif analytics_view == "Skills Analysis":
         st.subheader("Staff Distribution by Skill")
         
-        skills_data = db.get_analytics_by_skill()
+        skills_data = analytics_by_skill(db.version)
         
         st.dataframe(skills_data, use_container_width=True, hide_index=True)
         
-        fig = px.bar(skills_data.head(15), x='Skill', y='Employee_Count',
-                    title="Top 15 Skills in Organization",
-                    color_discrete_sequence=['#4A90E2'])
-        fig = style_chart(fig)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(skills_figure(db.version), use_container_width=True)
     
-    with tab3:
+    elif analytics_view == "Role Distribution":
         st.subheader("Staff Distribution by Role")
         
-        role_data = db.get_analytics_by_role()
+        role_data = analytics_by_role(db.version)
         
         st.dataframe(role_data, use_container_width=True, hide_index=True)
         
         col1, col2 = st.columns(2)
+        pie_fig, bar_fig = role_figures(db.version)
         
         with col1:
-            fig = px.pie(role_data, values='Employee_Count', names='Standard_Role',
-                        title="Employee Distribution by Role",
-                        color_discrete_sequence=['#4A90E2', '#7B68EE', '#5B9BD5', '#9370DB'])
-            fig = style_chart(fig)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(pie_fig, use_container_width=True)
         
         with col2:
-            fig = px.bar(role_data, x='Standard_Role', y='Employee_Count',
-                        title="Employee Count by Role",
-                        color_discrete_sequence=['#4A90E2'])
-            fig = style_chart(fig)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(bar_fig, use_container_width=True)
 
 # ============================================================================
 # COMPLEX SEARCH
@@ -826,6 +1305,32 @@ elif page == "Complex Search":
     - Example: "Find all senior Python engineers in Texas who worked on law enforcement projects"
     """)
     
+    # Quick searches fill the filter widgets through session_state, then run the search
+    quick_searches = {
+        "Senior Python Engineers in Texas (Law Enforcement)": dict(
+            search_skills=["Python"], search_role="Senior Engineer",
+            search_location="Texas", search_industry="Law Enforcement"),
+        "Computer Vision Experts (Federal Clients)": dict(
+            search_skills=["CV", "OpenCV"], search_client="Federal"),
+        "Data Science Leaders": dict(
+            search_skills=["Data Science"], search_role="Division Director"),
+    }
+    
+    def apply_quick_search(preset):
+        """Reset the filter widgets, apply a preset and queue the search"""
+        state = st.session_state
+        state.search_skills = [skill for skill in preset.get('search_skills', [])
+                               if skill in unique_skills(db.version)]
+        state.search_location = preset.get('search_location', "")
+        state.search_years = 0
+        for key, table, column in [('search_role', 'roles', 'Standard_Role'),
+                                   ('search_client', 'projects', 'Client'),
+                                   ('search_industry', 'projects', 'Industry')]:
+            wanted = preset.get(key, "").lower()
+            matches = [opt for opt in category_options(db.version, table, column) if wanted and wanted in opt.lower()]
+            state[key] = matches[0] if matches else "Any"
+        state.run_search = True
+    
     # Search filters
     col1, col2, col3 = st.columns(3)
     
@@ -833,78 +1338,78 @@ elif page == "Complex Search":
         st.markdown("### Employee Criteria")
         
         # Skills
-        all_skills = set()
-        for skills_str in db.employees_df['Skills'].dropna():
-            all_skills.update([s.strip() for s in str(skills_str).split(';')])
-        search_skills = st.multiselect("Required Skills", sorted(all_skills))
+        search_skills = st.multiselect("Required Skills", unique_skills(db.version), key='search_skills')
         
         # Role
-        roles = db.roles_df['Standard_Role'].unique()
-        search_role = st.selectbox("Role", ["Any"] + list(roles))
+        roles = category_options(db.version, 'roles', 'Standard_Role')
+        search_role = st.selectbox("Role", ("Any",) + roles, key='search_role')
         
         # Location
-        search_location = st.text_input("Location (e.g., Texas, Austin)")
+        search_location = st.text_input("Location (e.g., Texas, Austin)", key='search_location')
     
     with col2:
         st.markdown("### Experience Criteria")
         
         # Client experience
-        clients = db.projects_df['Client'].unique()
-        search_client = st.selectbox("Client Experience", ["Any"] + list(clients))
+        clients = category_options(db.version, 'projects', 'Client')
+        search_client = st.selectbox("Client Experience", ("Any",) + clients, key='search_client')
         
         # Industry experience
-        industries = db.projects_df['Industry'].unique()
-        search_industry = st.selectbox("Industry Experience", ["Any"] + list(industries))
+        industries = category_options(db.version, 'projects', 'Industry')
+        search_industry = st.selectbox("Industry Experience", ("Any",) + industries, key='search_industry')
         
         # Years of experience
-        search_years = st.number_input("Minimum Years Experience", min_value=0, value=0)
+        search_years = st.number_input("Minimum Years Experience", min_value=0, key='search_years')
     
     with col3:
         st.markdown("### Quick Searches")
         
-        if st.button("Senior Python Engineers in Texas (Law Enforcement)"):
-            search_skills = ["Python"]
-            search_role = "Senior Engineer"
-            search_location = "Texas"
-            search_industry = "Law Enforcement"
-        
-        if st.button("Computer Vision Experts (Federal Clients)"):
-            search_skills = ["CV", "OpenCV"]
-            search_client = "Federal"
-        
-        if st.button("Data Science Leaders"):
-            search_skills = ["Data Science"]
-            search_role = "Division Director"
+        for label, preset in quick_searches.items():
+            st.button(label, on_click=apply_quick_search, args=(preset,))
     
     # Execute search
-    if st.button("Search", type="primary"):
-        results = db.complex_search(
-            skills=search_skills if search_skills else None,
+    if st.button("Search", type="primary") or st.session_state.pop('run_search', False):
+        st.session_state.search_args = dict(
+            skills=tuple(sorted(search_skills)) if search_skills else None,
             location=search_location if search_location else None,
             role=search_role if search_role != "Any" else None,
             client_experience=search_client if search_client != "Any" else None,
             industry_experience=search_industry if search_industry != "Any" else None,
             min_years_exp=search_years if search_years > 0 else None
         )
+        st.session_state.search_page = 1
+    
+    # Results persist across reruns so the page selector can move through them
+    if 'search_args' in st.session_state:
+        search_args = st.session_state.search_args
+        results = complex_search(db.version, **search_args)
         
         st.markdown("---")
         st.markdown(f"### Search Results: {len(results)} employees found")
         
         if len(results) > 0:
-            # Display summary
+            # Display summary, one page of rows at a time
+            page_size = 50
+            page_count = (len(results) - 1) // page_size + 1
+            if page_count > 1:
+                results_page = st.number_input("Page", min_value=1, max_value=page_count, key='search_page')
+                start = (results_page - 1) * page_size
+                st.caption(f"Showing {start + 1}-{min(start + page_size, len(results))} of {len(results)}")
+            else:
+                start = 0
+            
             st.dataframe(
-                results[['Employee_ID', 'Name', 'Job_Title', 'Location', 'Skills',
-                        'Standard_Role', 'Clients_Worked', 'Industries_Worked', 
-                        'Total_Hours_Billed']],
+                results.iloc[start:start + page_size][['Employee_ID', 'Name', 'Job_Title', 'Location', 'Skills',
+                                                       'Standard_Role', 'Clients_Worked', 'Industries_Worked',
+                                                       'Total_Hours_Billed']],
                 use_container_width=True,
                 hide_index=True
             )
             
             # Export option
-            csv = results.to_csv(index=False)
             st.download_button(
                 label="Download Results as CSV",
-                data=csv,
+                data=complex_search_csv(db.version, **search_args),
                 file_name=f"search_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                 mime="text/csv"
             )
@@ -930,10 +1435,7 @@ elif page == "AI Staffing Matrix":
         st.markdown("---")
         st.markdown("## AI Staffing Matrix Process Overview")
         
-        st.markdown("""
-        This system uses advanced AI and data pipeline technologies to automate the entire staffing process 
-        from RFP analysis to candidate recommendation.
-        """)
+        st.markdown(PROCESS_INTRO)
         
         # Display process diagram
         try:
@@ -943,183 +1445,12 @@ elif page == "AI Staffing Matrix":
             pass  # If diagram not found, continue without it
         
         # Process steps in expandable sections
-        with st.expander("**Step 1: RFP/RFI Document Parsing**", expanded=True):
-            st.markdown("""
-            **Technology:** Large Language Models (LLMs) with document understanding capabilities
-            
-            **Process:**
-            1. **Document Ingestion**: PDF/Word documents are uploaded to the system
-            2. **Text Extraction**: OCR and text parsing extract content from documents
-            3. **LLM Analysis**: Advanced language models analyze the document to identify:
-               - Required technical skills (e.g., Python, Computer Vision, TensorFlow)
-               - Domain expertise requirements (e.g., Law Enforcement, Government)
-               - Team composition needs (roles, seniority levels, quantities)
-               - Location requirements and preferences
-               - Certifications and security clearances
-               - Project timeline and budget constraints
-            4. **Structured Output**: Extracted requirements are converted to structured data (CSV/JSON)
-            
-            **Output:** `LLM_Parsed.docx` and `parsed_requirements.csv` containing categorized requirements
-            """)
-        
-        with st.expander("**Step 2: Data Pipeline Integration**"):
-            st.markdown("""
-            **Technology:** Relational database with normalized schema and foreign key relationships
-            
-            **Data Sources Integrated:**
-            - **Employee Master Data**: Employee_ID, Name, Email, Role_ID, Skills, Location
-            - **Role Definitions**: Role_ID → Standard_Role mapping with title variants
-            - **Project History**: Billing_Code → Project details (Client, Industry, Technologies)
-            - **Billing Records**: Employee_ID × Billing_Code × Year (hours, roles)
-            - **Resume Data**: Employee_ID → Education, Experience, Certifications, Summary
-            - **Deliverables**: Billing_Code → Deliverable outputs and technologies used
-            
-            **Relationships Established:**
-            ```
-            Employee_ID: employees ↔ billing ↔ resume_data
-            Role_ID: employees ↔ roles (standardization)
-            Billing_Code: projects ↔ billing ↔ deliverables
-            ```
-            
-            **Data Quality:**
-            - Automated validation of foreign key integrity
-            - Deduplication and normalization
-            - Historical data spanning multiple years
-            """)
-        
-        with st.expander("**Step 3: Role & Responsibility Identification**"):
-            st.markdown("""
-            **Technology:** Pattern matching and historical analysis algorithms
-            
-            **Process:**
-            1. **SoW Analysis**: Previous Statements of Work are analyzed to understand:
-               - Common role definitions for similar projects
-               - Typical team structures for project types
-               - Responsibility matrices and reporting relationships
-            
-            2. **Deliverable Mapping**: System examines past deliverables by Billing_Code:
-               - Technologies used in similar projects
-               - Complexity levels and team sizes
-               - Success metrics and outcomes
-            
-            3. **Role Standardization**: Maps job titles to standard roles:
-               - "Technical Lead - AI/ML" → Technical Lead
-               - "Senior CV Engineer" → Senior Engineer
-               - Accounts for title variants across departments
-            
-            4. **Organizational Hierarchy**: Infers reporting structure:
-               - Technical Leads report to VP of Engineering
-               - Senior Engineers report to Engineering Manager
-               - Project Managers report to PMO Director
-            
-            **Output:** Recommended roles with clear responsibilities based on proven patterns
-            """)
-        
-        with st.expander("**Step 4: Candidate Identification & Scoring**"):
-            st.markdown("""
-            **Technology:** Multi-factor AI matching algorithm with weighted scoring
-            
-            **Matching Criteria (Weighted):**
-            
-            1. **Skills Match (35%)**:
-               - Exact skill matches from employee profiles
-               - Related/transferable skills consideration
-               - Technology stack alignment
-            
-            2. **Domain Experience (25%)**:
-               - Industry experience (Law Enforcement, Government, etc.)
-               - Client type experience (Federal, State, Local)
-               - Project type similarity
-            
-            3. **Location Compatibility (15%)**:
-               - Geographic proximity to project site
-               - Remote work capability
-               - Travel requirements alignment
-            
-            4. **Past Performance (15%)**:
-               - Historical billing hours (commitment level)
-               - Project success rates
-               - Client feedback scores
-               - Deliverable quality metrics
-            
-            5. **Certifications & Clearances (10%)**:
-               - Required certifications (PMP, AWS, etc.)
-               - Security clearance status
-               - Professional licenses
-            
-            **Scoring Algorithm:**
-            ```
-            Fit_Score = (Skills_Match × 0.35) + 
-                       (Domain_Experience × 0.25) + 
-                       (Location_Match × 0.15) + 
-                       (Past_Performance × 0.15) + 
-                       (Certifications × 0.10)
-            ```
-            
-            **Database Search:**
-            - Searches across 100,000+ employee profiles
-            - Parallel processing for sub-second results
-            - Ranked output with top candidates highlighted
-            """)
-        
-        with st.expander("**Step 5: Team Composition & Cost Optimization**"):
-            st.markdown("""
-            **Technology:** Optimization algorithms and financial modeling
-            
-            **Team Assembly:**
-            1. **Role Coverage**: Ensures all required roles are filled
-            2. **Skill Overlap**: Validates comprehensive skill coverage
-            3. **Seniority Balance**: Appropriate mix of leads and engineers
-            4. **Availability Check**: Confirms candidate availability
-            
-            **Cost Calculation:**
-            - Role-based hourly rates (market-adjusted)
-            - Estimated hours per role based on project scope
-            - Base cost calculation: Σ(Rate × Hours) for all roles
-            - Profit margin application (adjustable 0-30%)
-            - Final bid price generation
-            
-            **Output:**
-            - Staffing matrix with candidate details
-            - Cost breakdown by role
-            - Skills coverage matrix
-            - Team composition visualizations
-            """)
-        
-        with st.expander("**Step 6: Communication & Workflow**"):
-            st.markdown("""
-            **Automated Communications:**
-            
-            1. **Manager Approval Route**:
-               - Identifies candidates' managers via org hierarchy
-               - Sends approval requests with candidate details
-               - Tracks responses and availability confirmations
-            
-            2. **Direct Candidate Contact**:
-               - Personalized opportunity notifications
-               - Role-specific details and fit score
-               - Project information and timeline
-            
-            3. **Stakeholder Updates**:
-               - Staffing matrix distribution
-               - Cost proposals and justifications
-               - Team composition presentations
-            
-            **Export Capabilities:**
-            - CSV downloads for further analysis
-            - PDF staffing matrices for proposals
-            - PowerPoint presentations for stakeholder meetings
-            """)
+        for i, (title, body) in enumerate(PROCESS_STEPS):
+            with st.expander(title, expanded=(i == 0)):
+                st.markdown(body)
         
         st.markdown("---")
-        st.success("""
-        **Key Benefits:**
-        - **Speed**: Reduces staffing time from weeks to minutes
-        - **Accuracy**: Data-driven matching eliminates guesswork
-        - **Transparency**: Clear scoring and justification for every candidate
-        - **Cost Optimization**: Automated pricing with margin controls
-        - **Scalability**: Handles 100,000+ employees effortlessly
-        """)
+        st.success(PROCESS_BENEFITS)
         
         if st.button("Close", type="primary"):
             st.session_state.show_process_info = False
@@ -1147,9 +1478,10 @@ elif page == "AI Staffing Matrix":
             help="Upload your RFP or RFI document. AI will extract requirements automatically."
         )
         
-        # Demo button to load actual RFI
+        # Demo button to load actual RFI (kept in session_state, since the button is only
+        # True on the run it was clicked and later widget reruns must keep the results)
         if st.button("Load Texas Police RFI (CID202503141041)"):
-            uploaded_file = "sample"
+            st.session_state.rfi_source = "sample"
         
         st.caption("Source: 1742506162_2025-3-20_CID202503141041.pdf")
     
@@ -1169,14 +1501,13 @@ elif page == "AI Staffing Matrix":
         """)
     
     # If file is uploaded or sample is loaded
+    uploaded_file = uploaded_file or st.session_state.get('rfi_source')
     if uploaded_file:
         st.markdown("---")
         st.subheader("Step 2: AI Document Analysis")
         
-        # Simulate AI processing
         with st.spinner("AI is analyzing document and extracting requirements..."):
-            import time
-            time.sleep(1.5)
+            requirements_df = parsed_requirements()
         
         st.success("Document parsed successfully!")
         
@@ -1193,9 +1524,7 @@ elif page == "AI Staffing Matrix":
             The AI has extracted all requirements from the PDF and generated structured data for candidate matching.
             """)
         
-        # Load and display parsed requirements
-        requirements_df = pd.read_csv("Data/parsed_requirements.csv")
-        
+        # Display parsed requirements
         col1, col2 = st.columns(2)
         
         with col1:
@@ -1204,12 +1533,8 @@ elif page == "AI Staffing Matrix":
         
         with col2:
             st.markdown("### Requirement Breakdown")
-            req_counts = requirements_df.groupby('Requirement_Type').size()
-            fig = px.bar(x=req_counts.index, y=req_counts.values,
-                        title="Requirements by Category",
-                        labels={'x': 'Category', 'y': 'Count'},
-                        color_discrete_sequence=['#4A90E2'])
-            fig = style_chart(fig)
+            req_counts = requirements_df.groupby('Requirement_Type', observed=True).size()
+            fig = requirements_figure(tuple(req_counts.index), tuple(req_counts.tolist()))
             st.plotly_chart(fig, use_container_width=True)
         
         # Simulate database search
@@ -1217,27 +1542,7 @@ elif page == "AI Staffing Matrix":
         st.subheader("Step 3: Intelligent Candidate Matching")
         
         with st.spinner("Searching 100,000+ employee database..."):
-            time.sleep(2)
-            
-            # Progress bar simulation
-            progress_text = st.empty()
-            progress_bar = st.progress(0)
-            
-            stages = [
-                ("Filtering by location (Texas)...", 20),
-                ("Matching technical skills (CV, Python)...", 40),
-                ("Checking domain experience (Law Enforcement)...", 60),
-                ("Validating certifications and clearances...", 80),
-                ("Ranking candidates by fit score...", 100)
-            ]
-            
-            for stage_text, progress in stages:
-                progress_text.text(stage_text)
-                progress_bar.progress(progress)
-                time.sleep(0.4)
-            
-            progress_text.empty()
-            progress_bar.empty()
+            matched_candidates = staffing_matrix(db.version)
         
         st.success("Found 3 highly qualified candidates from 100,000+ employee database!")
         
@@ -1250,96 +1555,22 @@ elif page == "AI Staffing Matrix":
         Candidates are ranked by fit score, which considers skills match, experience, location, and past performance.
         """)
         
-        # Create enhanced candidate data - get all Texas employees with relevant skills
-        matched_candidates = db.get_employee_directory(
-            skills=["Python", "CV"],
-            location="Texas"
-        )
-        
         if len(matched_candidates) > 0:
-            # Limit to top candidates and add AI-generated fit scores and analysis
-            # Sort by skills match and take top candidates
-            matched_candidates = matched_candidates.head(5)  # Get top 5 candidates
-            
-            # Define detailed match data for each candidate based on their actual profiles
-            match_data = {
-                '10004': {
-                    'score': 98,
-                    'role': 'Technical Lead',
-                    'reasons': 'PhD in CV from MIT, 12y facial recognition systems, 8y law enforcement AI, AWS certified, Austin-based, Active security clearance'
-                },
-                '10005': {
-                    'score': 96,
-                    'role': 'Senior Engineer',
-                    'reasons': 'MS Stanford, 9y CV engineering, 6y law enforcement systems, Developed solutions for 3 state police departments, TensorFlow expert'
-                },
-                '10006': {
-                    'score': 94,
-                    'role': 'Senior Architect',
-                    'reasons': '11y enterprise architecture, 7y government projects, Active security clearance, AWS certified, Austin-based, API development expert'
-                },
-                '10007': {
-                    'score': 93,
-                    'role': 'Senior Engineer',
-                    'reasons': 'PhD AI from Carnegie Mellon, 10y AI research, 5y law enforcement ML, Published 15+ papers, TensorFlow/PyTorch expert'
-                },
-                '10008': {
-                    'score': 91,
-                    'role': 'Project Manager',
-                    'reasons': 'PMP certified, 8y PM experience, 6y government contracts, 4y law enforcement projects, Managed $50M+ in government tech'
-                },
-                '10001': {
-                    'score': 89,
-                    'role': 'Technical Lead',
-                    'reasons': '10y police tech, 4y divisional management, PMP certified, Python CV expert, Austin-based, Leadership experience'
-                },
-                '10002': {
-                    'score': 87,
-                    'role': 'Senior Engineer',
-                    'reasons': '7y police tech, 5y data analytics, 3y CV projects, CFE certified, Data science background'
-                },
-                '10003': {
-                    'score': 85,
-                    'role': 'Senior Engineer',
-                    'reasons': 'PhD AI, 8y Python engineer, 2y federal law enforcement support, AWS DevOps certified, TensorFlow experience'
-                }
-            }
-            
-            # Apply match data to candidates
-            scores = []
-            roles = []
-            reasons = []
-            
-            for _, candidate in matched_candidates.iterrows():
-                emp_id = str(candidate['Employee_ID'])
-                if emp_id in match_data:
-                    scores.append(match_data[emp_id]['score'])
-                    roles.append(match_data[emp_id]['role'])
-                    reasons.append(match_data[emp_id]['reasons'])
-                else:
-                    scores.append(80)
-                    roles.append('Senior Engineer')
-                    reasons.append('Qualified candidate with relevant skills and experience')
-            
-            matched_candidates['AI_Fit_Score'] = scores
-            matched_candidates['Recommended_Role'] = roles
-            matched_candidates['Match_Reasons'] = reasons
-            
-            # Sort by fit score
-            matched_candidates = matched_candidates.sort_values('AI_Fit_Score', ascending=False)
-            
             # Display summary statistics
+            candidate_count, avg_fit, top_fit, unique_roles = staffing_summary(db.version)
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("Candidates Matched", len(matched_candidates))
+                st.metric("Candidates Matched", candidate_count)
             with col2:
-                st.metric("Avg Fit Score", f"{matched_candidates['AI_Fit_Score'].mean():.1f}%")
+                st.metric("Avg Fit Score", f"{avg_fit:.1f}%")
             with col3:
-                st.metric("Top Score", f"{matched_candidates['AI_Fit_Score'].max():.0f}%")
+                st.metric("Top Score", f"{top_fit:.0f}%")
             with col4:
-                unique_roles = matched_candidates['Recommended_Role'].nunique()
                 st.metric("Roles Covered", unique_roles)
             
+            # One pass over the candidate rows, shared by the summary and profile tabs
+            candidates = list(matched_candidates.itertuples())
+            
             # Display in tabs
             tab1, tab2, tab3 = st.tabs(["Candidate Summary", "Detailed Profiles", "Team Composition"])
             
@@ -1353,7 +1584,7 @@ elif page == "AI Staffing Matrix":
                 
                 # Style the dataframe
                 st.dataframe(
-                    display_df.style.background_gradient(subset=['Fit Score (%)'], cmap='Blues', vmin=80, vmax=100),
+                    display_df.style.apply(score_gradient, subset=['Fit Score (%)'], vmin=80, vmax=100),
                     use_container_width=True,
                     hide_index=True
                 )
@@ -1365,57 +1596,56 @@ elif page == "AI Staffing Matrix":
                 
                 with col1:
                     # Fit score visualization
-                    fig = px.bar(matched_candidates, x='Name', y='AI_Fit_Score',
-                               title="Candidate Fit Scores",
-                               color='AI_Fit_Score',
-                               color_continuous_scale=['#7B68EE', '#4A90E2'],
-                               labels={'AI_Fit_Score': 'Fit Score (%)', 'Name': 'Candidate'},
-                               text='AI_Fit_Score')
-                    fig.update_traces(texttemplate='%{text:.0f}%', textposition='outside')
-                    fig = style_chart(fig)
+                    fig = fit_score_figure(tuple(matched_candidates['Name'].tolist()),
+                                           tuple(matched_candidates['AI_Fit_Score'].tolist()))
                     st.plotly_chart(fig, use_container_width=True)
                 
                 with col2:
                     # Role distribution
-                    role_counts = matched_candidates['Recommended_Role'].value_counts()
-                    fig = px.pie(values=role_counts.values, names=role_counts.index,
-                               title="Proposed Team Roles",
-                               color_discrete_sequence=['#4A90E2', '#7B68EE', '#5B9BD5', '#9370DB'])
-                    fig = style_chart(fig)
+                    role_counts = (matched_candidates.groupby('Recommended_Role', observed=True, sort=False).size()
+                                   .sort_values(ascending=False, kind='stable'))
+                    fig = team_roles_figure(tuple(role_counts.index), tuple(role_counts.tolist()))
                     st.plotly_chart(fig, use_container_width=True)
                 
                 # Match reasons table
                 st.markdown("---")
                 st.markdown("### Why These Candidates?")
                 
-                for idx, candidate in matched_candidates.iterrows():
-                    with st.expander(f"{candidate['Name']} ({candidate['AI_Fit_Score']}% match) - {candidate['Recommended_Role']}", expanded=False):
+                for candidate in candidates:
+                    with st.expander(f"{candidate.Name} ({candidate.AI_Fit_Score}% match) - {candidate.Recommended_Role}", expanded=False):
                         col_a, col_b = st.columns([1, 2])
                         with col_a:
-                            st.write(f"**Employee ID:** {candidate['Employee_ID']}")
-                            st.write(f"**Location:** {candidate['Location']}")
-                            st.write(f"**Current Role:** {candidate['Job_Title']}")
+                            st.write(f"**Employee ID:** {candidate.Employee_ID}")
+                            st.write(f"**Location:** {candidate.Location}")
+                            st.write(f"**Current Role:** {candidate.Job_Title}")
                         with col_b:
-                            st.success(f"**Match Analysis:** {candidate['Match_Reasons']}")
-                            st.write(f"**Key Skills:** {candidate['Skills']}")
+                            st.success(f"**Match Analysis:** {candidate.Match_Reasons}")
+                            st.write(f"**Key Skills:** {candidate.Skills}")
             
             with tab2:
                 st.markdown("### Detailed Candidate Profiles")
                 st.markdown("Complete background information for each recommended candidate")
                 
-                for idx, candidate in matched_candidates.iterrows():
+                # Resumes and project histories for every candidate in two queries
+                candidate_ids = tuple(matched_candidates['Employee_ID'].tolist())
+                resumes_by_id = resume_matrix_bulk(db.version, candidate_ids).set_index('Employee_ID')
+                histories_by_id = dict(tuple(employee_project_history_bulk(db.version, candidate_ids).groupby('Employee_ID', sort=False)))
+                skill_lines = matched_candidates['Skills'].str.split(';').map(
+                    lambda skills: "  \n".join(f"• {skill.strip()}" for skill in skills))
+                
+                for candidate in candidates:
                     # Color code by fit score
-                    if candidate['AI_Fit_Score'] >= 95:
+                    if candidate.AI_Fit_Score >= 95:
                         badge = "Excellent Match"
-                    elif candidate['AI_Fit_Score'] >= 90:
+                    elif candidate.AI_Fit_Score >= 90:
                         badge = "Strong Match"
                     else:
                         badge = "Good Match"
                     
-                    with st.expander(f"{candidate['Name']} - {candidate['AI_Fit_Score']}% | {badge}", expanded=(idx==0)):
+                    with st.expander(f"{candidate.Name} - {candidate.AI_Fit_Score}% | {badge}", expanded=(candidate.Index == 0)):
                         # Header with key info
-                        st.markdown(f"### {candidate['Name']}")
-                        st.markdown(f"**Proposed for:** {candidate['Recommended_Role']} | **Fit Score:** {candidate['AI_Fit_Score']}%")
+                        st.markdown(f"### {candidate.Name}")
+                        st.markdown(f"**Proposed for:** {candidate.Recommended_Role} | **Fit Score:** {candidate.AI_Fit_Score}%")
                         
                         st.markdown("---")
                         
@@ -1423,25 +1653,23 @@ elif page == "AI Staffing Matrix":
                         
                         with col1:
                             st.markdown("#### Profile Information")
-                            st.write(f"**Employee ID:** {candidate['Employee_ID']}")
-                            st.write(f"**Current Title:** {candidate['Job_Title']}")
-                            st.write(f"**Location:** {candidate['Location']}")
-                            st.write(f"**Email:** {candidate['Email']}")
+                            st.write(f"**Employee ID:** {candidate.Employee_ID}")
+                            st.write(f"**Current Title:** {candidate.Job_Title}")
+                            st.write(f"**Location:** {candidate.Location}")
+                            st.write(f"**Email:** {candidate.Email}")
                             
                             st.markdown("#### Technical Skills")
-                            skills_list = candidate['Skills'].split(';')
-                            for skill in skills_list:
-                                st.write(f"• {skill.strip()}")
+                            st.markdown(skill_lines[candidate.Index])
                             
                             # Get resume data
-                            resume = db.get_resume_matrix(candidate['Employee_ID'])
+                            resume = resumes_by_id.loc[[candidate.Employee_ID]]
                             if len(resume) > 0:
                                 st.markdown("#### Certifications")
                                 st.write(resume.iloc[0]['Certifications'])
                         
                         with col2:
                             st.markdown("#### AI Match Analysis")
-                            st.success(candidate['Match_Reasons'])
+                            st.success(candidate.Match_Reasons)
                             
                             # Get resume data
                             if len(resume) > 0:
@@ -1457,7 +1685,7 @@ elif page == "AI Staffing Matrix":
                         # Project history section (full width)
                         st.markdown("---")
                         st.markdown("#### Relevant Project History")
-                        projects = db.get_employee_project_history(candidate['Employee_ID'])
+                        projects = histories_by_id.get(candidate.Employee_ID, pd.DataFrame())
                         if len(projects) > 0:
                             project_display = projects[['Project_Name', 'Client', 'Industry', 'Year', 'Hours_Billed', 'Role_in_Project']].head(5)
                             st.dataframe(project_display, use_container_width=True, hide_index=True)
@@ -1465,8 +1693,8 @@ elif page == "AI Staffing Matrix":
                             st.write("No project history available")
                         
                         # LinkedIn link
-                        if pd.notna(candidate['LinkedIn_URL']):
-                            st.markdown(f"[View LinkedIn Profile]({candidate['LinkedIn_URL']})")
+                        if pd.notna(candidate.LinkedIn_URL):
+                            st.markdown(f"[View LinkedIn Profile]({candidate.LinkedIn_URL})")
             
             with tab3:
                 st.markdown("### Proposed Team Composition")
@@ -1475,95 +1703,86 @@ elif page == "AI Staffing Matrix":
                 
                 with col1:
                     st.markdown("**Team Structure**")
-                    team_structure = matched_candidates.groupby('Recommended_Role').size().reset_index()
+                    team_structure = matched_candidates.groupby('Recommended_Role', observed=True).size().reset_index()
                     team_structure.columns = ['Role', 'Count']
                     st.dataframe(team_structure, use_container_width=True, hide_index=True)
                     
                     st.markdown("---")
                     st.markdown("**Cost Estimation Tool**")
                     
-                    # Define role-based rates and hours
-                    role_rates = {
-                        'Technical Lead': {'rate': 225, 'hours': 1800},
-                        'Senior Engineer': {'rate': 185, 'hours': 1600},
-                        'Senior Architect': {'rate': 200, 'hours': 1500},
-                        'Project Manager': {'rate': 165, 'hours': 1400},
-                        'AI Research Lead': {'rate': 210, 'hours': 1500}
-                    }
-                    
-                    # Calculate costs by role
-                    cost_breakdown = []
-                    total_cost = 0
-                    total_hours = 0
-                    
-                    for _, candidate in matched_candidates.iterrows():
-                        role = candidate['Recommended_Role']
-                        if role in role_rates:
-                            rate = role_rates[role]['rate']
-                            hours = role_rates[role]['hours']
-                            cost = rate * hours
-                            total_cost += cost
-                            total_hours += hours
-                            cost_breakdown.append({
-                                'Role': role,
-                                'Name': candidate['Name'],
-                                'Rate ($/hr)': f"${rate}",
-                                'Est. Hours': hours,
-                                'Subtotal': f"${cost:,.0f}"
-                            })
+                    # Calculate costs by role (candidates whose role has no rate are left out)
+                    costs = matched_candidates[['Recommended_Role', 'Name']].join(
+                        role_rates(), on='Recommended_Role').dropna(subset=['rate']).astype({'rate': int, 'hours': int})
+                    costs['cost'] = costs['rate'] * costs['hours']
+                    total_cost = int(costs['cost'].sum())
+                    total_hours = int(costs['hours'].sum())
                     
                     # Display cost breakdown
-                    cost_df = pd.DataFrame(cost_breakdown)
-                    st.dataframe(cost_df, use_container_width=True, hide_index=True)
-                    
-                    # Profit margin slider
-                    st.markdown("---")
-                    st.markdown("**Profit Margin & Final Pricing**")
-                    profit_margin = st.slider(
-                        "Adjust Profit Margin (%)",
-                        min_value=0,
-                        max_value=30,
-                        value=7,
-                        step=1,
-                        help="Adjust the profit margin to calculate final bid price"
+                    cost_df = pd.DataFrame({
+                        'Role': costs['Recommended_Role'],
+                        'Name': costs['Name'],
+                        'Rate ($/hr)': costs['rate'],
+                        'Est. Hours': costs['hours'],
+                        'Subtotal': costs['cost']
+                    })
+                    st.dataframe(
+                        cost_df,
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={
+                            'Rate ($/hr)': st.column_config.NumberColumn(format='$%d'),
+                            'Subtotal': st.column_config.NumberColumn(format='$%d')
+                        }
                     )
                     
-                    # Calculate final costs
-                    profit_amount = total_cost * (profit_margin / 100)
-                    final_price = total_cost + profit_amount
-                    
-                    # Display metrics
-                    col_a, col_b = st.columns(2)
-                    with col_a:
-                        st.metric("Base Cost", f"${total_cost:,.0f}")
-                        st.metric("Total Hours", f"{total_hours:,.0f}")
-                    
-                    with col_b:
-                        st.metric("Profit Amount", f"${profit_amount:,.0f}", f"{profit_margin}%")
-                        st.metric("Final Bid Price", f"${final_price:,.0f}", delta=f"+${profit_amount:,.0f}")
+                    # Profit margin slider (a fragment, so moving it reruns only this panel)
+                    @st.fragment
+                    def profit_panel(total_cost, total_hours):
+                        """Profit margin slider with the resulting price metrics"""
+                        st.markdown("---")
+                        st.markdown("**Profit Margin & Final Pricing**")
+                        profit_margin = st.slider(
+                            "Adjust Profit Margin (%)",
+                            min_value=0,
+                            max_value=30,
+                            value=7,
+                            step=1,
+                            help="Adjust the profit margin to calculate final bid price"
+                        )
+                        
+                        # Calculate final costs
+                        profit_amount = total_cost * (profit_margin / 100)
+                        final_price = total_cost + profit_amount
+                        
+                        # Display metrics
+                        col_a, col_b = st.columns(2)
+                        with col_a:
+                            st.metric("Base Cost", f"${total_cost:,.0f}")
+                            st.metric("Total Hours", f"{total_hours:,.0f}")
+                        
+                        with col_b:
+                            st.metric("Profit Amount", f"${profit_amount:,.0f}", f"{profit_margin}%")
+                            st.metric("Final Bid Price", f"${final_price:,.0f}", delta=f"+${profit_amount:,.0f}")
+                        
+                        # Average rate
+                        avg_rate = total_cost / total_hours if total_hours > 0 else 0
+                        st.info(f"**Average Blended Rate:** ${avg_rate:.2f}/hour | **Final Rate with Margin:** ${final_price/total_hours:.2f}/hour")
                     
-                    # Average rate
-                    avg_rate = total_cost / total_hours if total_hours > 0 else 0
-                    st.info(f"**Average Blended Rate:** ${avg_rate:.2f}/hour | **Final Rate with Margin:** ${final_price/total_hours:.2f}/hour")
+                    profit_panel(total_cost, total_hours)
                 
                 with col2:
                     st.markdown("**Skills Coverage**")
                     
-                    # Skills matrix
-                    required_skills = ['Python', 'CV', 'OpenCV', 'TensorFlow', 'AWS', 'Leadership']
-                    skills_matrix = []
-                    
-                    for _, candidate in matched_candidates.iterrows():
-                        candidate_skills = str(candidate['Skills']).split(';')
-                        row = {'Name': candidate['Name']}
-                        for skill in required_skills:
-                            row[skill] = 'Yes' if any(skill.lower() in s.lower() for s in candidate_skills) else 'No'
-                        skills_matrix.append(row)
+                    # Skills matrix (built and rendered only once the user asks to see it)
+                    if st.checkbox("Show skills matrix", key='show_skills'):
+                        st.dataframe(skills_coverage(db.version, REQUIRED_SKILLS),
+                                     use_container_width=True, hide_index=True)
                     
-                    skills_df = pd.DataFrame(skills_matrix)
-                    st.dataframe(skills_df, use_container_width=True, hide_index=True)
-                    
-                    st.success("All critical requirements covered by proposed team")
+                    uncovered = missing_skills(db.version, REQUIRED_SKILLS)
+                    if uncovered:
+                        st.warning(f"Not covered by proposed team: {', '.join(uncovered)}")
+                    else:
+                        st.success("All critical requirements covered by proposed team")
             
             # Export options
             st.markdown("---")
@@ -1572,7 +1791,7 @@ elif page == "AI Staffing Matrix":
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                csv_data = matched_candidates.to_csv(index=False)
+                csv_data = staffing_matrix_csv(db.version)
                 st.download_button(
                     label="Download as CSV",
                     data=csv_data,
@@ -1605,9 +1824,8 @@ elif page == "AI Staffing Matrix":
                 # Build recipient list
                 if email_option == "Email candidates directly":
                     st.markdown("**Recipients (Candidates):**")
-                    recipient_list = []
-                    for _, candidate in matched_candidates.iterrows():
-                        recipient_list.append(f"• {candidate['Name']} ({candidate['Email']})")
+                    recipient_list = [f"• {name} ({email})" for name, email in
+                                      zip(matched_candidates['Name'].tolist(), matched_candidates['Email'].tolist())]
                     st.markdown("\n".join(recipient_list))
                     
                     email_subject = f"Opportunity: {matched_candidates.iloc[0]['Recommended_Role']} - Texas Police RFI"
@@ -1634,60 +1852,17 @@ Staffing Team"""
                 
                 else:  # Email managers
                     st.markdown("**Recipients (Managers):**")
-                    # Get manager information from organizational structure
-                    manager_list = []
-                    unique_managers = set()
-                    
-                    for _, candidate in matched_candidates.iterrows():
-                        # Simulate manager lookup based on role hierarchy
-                        if 'Technical Lead' in candidate['Job_Title'] or 'Director' in candidate['Job_Title']:
-                            manager = "VP of Engineering (vp.engineering@company.com)"
-                        elif 'Senior' in candidate['Job_Title']:
-                            manager = "Engineering Manager (eng.manager@company.com)"
-                        elif 'Project Manager' in candidate['Job_Title']:
-                            manager = "PMO Director (pmo.director@company.com)"
-                        else:
-                            manager = "Department Manager (dept.manager@company.com)"
-                        
-                        if manager not in unique_managers:
-                            unique_managers.add(manager)
-                            manager_list.append(f"• {manager}")
-                    
-                    st.markdown("\n".join(manager_list))
+                    unique_managers, email_body = manager_email(db.version)
+                    st.markdown("\n".join(f"• {manager}" for manager in unique_managers))
                     
                     email_subject = "Staff Request: Texas Police RFI - High Priority Opportunity"
-                    email_body = f"""Dear Manager,
-
-We have identified {len(matched_candidates)} of your team members as excellent candidates for a high-priority project opportunity.
-
-**Project:** Texas Department of Public Safety - Statewide Facial Recognition System Enhancement
-**Client:** Texas DPS
-**Value:** $1.7M (estimated)
-**Duration:** 18 months
-**Start Date:** Q1 2026
-
-**Your Team Members Identified:**
-{chr(10).join([f"- {row['Name']} (Proposed: {row['Recommended_Role']}, Fit Score: {row['AI_Fit_Score']}%)" for _, row in matched_candidates.iterrows()])}
-
-These individuals were selected through our AI-powered matching system based on:
-- Technical skills alignment with RFI requirements
-- Domain expertise in law enforcement and government projects
-- Location compatibility (Texas-based)
-- Past performance on similar engagements
-- Security clearance status
-
-Please review the attached staffing matrix and confirm availability of your team members for this opportunity. We need responses by [deadline] to proceed with the proposal.
-
-The full project details and role descriptions are attached.
-
-Best regards,
-Business Development & Staffing Team"""
                 
                 # Email preview
                 st.markdown("---")
-                st.markdown("**Email Preview:**")
-                st.text_input("Subject:", value=email_subject, disabled=True)
-                st.text_area("Message:", value=email_body, height=300, disabled=True)
+                if st.checkbox("Show email preview", value=True, key='show_email_preview'):
+                    st.markdown("**Email Preview:**")
+                    st.text_input("Subject:", value=email_subject, disabled=True)
+                    st.text_area("Message:", value=email_body, height=300, disabled=True)
                 
                 # Attachments
                 st.markdown("**Attachments:**")
@@ -1699,7 +1874,7 @@ Business Development & Staffing Team"""
                 col_a, col_b, col_c = st.columns([1, 1, 2])
                 with col_a:
                     if st.button("Send Emails", type="primary"):
-                        st.success(f"✓ Emails sent to {len(matched_candidates) if email_option == 'Email candidates directly' else len(unique_managers)} recipients!")
+                        st.success(f"✓ Emails sent to {candidate_count if email_option == 'Email candidates directly' else len(unique_managers)} recipients!")
                         st.session_state.show_email_modal = False
                         st.rerun()
                 
@@ -1718,10 +1893,10 @@ Business Development & Staffing Team"""
                 st.metric("Database Searched", "100,000+", help="Total employees in database")
             
             with col2:
-                st.metric("Candidates Found", len(matched_candidates), help="Qualified candidates matching criteria")
+                st.metric("Candidates Found", candidate_count, help="Qualified candidates matching criteria")
             
             with col3:
-                st.metric("Avg Fit Score", f"{matched_candidates['AI_Fit_Score'].mean():.0f}%", help="Average match percentage")
+                st.metric("Avg Fit Score", f"{avg_fit:.0f}%", help="Average match percentage")
             
             with col4:
                 st.metric("Processing Time", "3.2s", help="AI analysis and matching time")
@@ -1743,52 +1918,30 @@ Business Development & Staffing Team"""
             st.markdown("### Example: Production Database Search Results")
             st.markdown("Below is a sample of what the AI would return when searching the full 100,000+ employee database:")
             
-            # Create notional data table
-            notional_data = pd.DataFrame({
-                'Employee_ID': ['EMP-45782', 'EMP-23901', 'EMP-67234', 'EMP-89012', 'EMP-34567'],
-                'Name': ['Dr. Marcus Rivera', 'Sarah Thompson', 'James Mitchell', 'Dr. Priya Patel', 'Michael O\'Brien'],
-                'Current_Title': ['Technical Lead - AI/ML', 'Senior CV Engineer', 'Senior Software Architect', 'AI Research Lead', 'Project Manager'],
-                'Location': ['Austin, TX', 'San Antonio, TX', 'Austin, TX', 'Dallas, TX', 'Houston, TX'],
-                'Fit_Score': [98, 96, 94, 93, 91],
-                'Proposed_Role': ['Technical Lead', 'Senior Engineer', 'Senior Architect', 'Senior Engineer', 'Project Manager'],
-                'Key_Skills': [
-                    'Python, CV, OpenCV, TensorFlow, PyTorch, AWS, Facial Recognition',
-                    'Python, CV, OpenCV, Deep Learning, Law Enforcement Systems',
-                    'Python, AWS, API Development, Security Clearance, Government',
-                    'Python, TensorFlow, PyTorch, Computer Vision, Research',
-                    'PMP, Agile, Government Contracts, Law Enforcement'
-                ],
-                'Years_Experience': [12, 9, 11, 10, 8],
-                'Security_Clearance': ['Active', 'Eligible', 'Active', 'N/A', 'N/A']
-            })
+            notional_data = notional_candidates()
             
-            # Display with styling
+            # Fit score drawn client-side as a progress bar
             st.dataframe(
-                notional_data.style.background_gradient(subset=['Fit_Score'], cmap='Blues', vmin=85, vmax=100),
+                notional_data,
                 use_container_width=True,
-                hide_index=True
+                hide_index=True,
+                column_config={
+                    'Fit_Score': st.column_config.ProgressColumn(min_value=85, max_value=100, format='%d%%')
+                }
             )
             
             # Add visualizations
             col1, col2 = st.columns(2)
             
             with col1:
-                fig = px.bar(notional_data, x='Name', y='Fit_Score',
-                           title="Candidate Fit Scores",
-                           color='Fit_Score',
-                           color_continuous_scale=['#7B68EE', '#4A90E2'],
-                           labels={'Fit_Score': 'Fit Score (%)', 'Name': 'Candidate'},
-                           text='Fit_Score')
-                fig.update_traces(texttemplate='%{text}%', textposition='outside')
-                fig = style_chart(fig)
+                fig = fit_score_figure(tuple(notional_data['Name'].tolist()),
+                                       tuple(notional_data['Fit_Score'].tolist()),
+                                       score_column='Fit_Score', text_template='%{text}%')
                 st.plotly_chart(fig, use_container_width=True)
             
             with col2:
                 role_counts = notional_data['Proposed_Role'].value_counts()
-                fig = px.pie(values=role_counts.values, names=role_counts.index,
-                           title="Proposed Team Roles",
-                           color_discrete_sequence=['#4A90E2', '#7B68EE', '#5B9BD5', '#9370DB'])
-                fig = style_chart(fig)
+                fig = team_roles_figure(tuple(role_counts.index), tuple(role_counts.tolist()))
                 st.plotly_chart(fig, use_container_width=True)
             
             # Cost estimate for notional team
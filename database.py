@@ -8,23 +8,189 @@ Relationships:
 - Role_ID: employees -> roles
 """
 
+import itertools
+import os
+import tempfile
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional
 import re
 
 
+def arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert object (text) columns to pyarrow-backed strings so Arrow serialization is zero-copy"""
+    text_cols = df.select_dtypes(include='object').columns
+    if len(text_cols) > 0:
+        df = df.astype({col: pd.StringDtype("pyarrow") for col in text_cols})
+    return df
+
+
+# Low-cardinality text columns stored as pandas categoricals
+CATEGORY_COLUMNS = ['Client', 'Industry', 'Location', 'Topic_Area', 'Standard_Role', 'Role_in_Project']
+
+
+# Process-wide load counter: a fresh WorkforceDatabase (e.g. after st.cache_resource.clear())
+# must not reuse an earlier instance's version, or version-keyed caches would serve its data
+LOAD_VERSIONS = itertools.count(1)
+
+
+# Join/filter keys indexed in SQLite after every load: (index name, table, columns).
+# The *_cover indexes also carry the columns the role and industry analytics read, so those
+# queries are answered from the index alone (at the cost of a second copy of those columns).
+SQLITE_INDEXES = [
+    ('idx_employees_id', 'employees', 'Employee_ID'),
+    ('idx_employees_role_cover', 'employees', 'Role_ID, Employee_ID, Location'),
+    ('idx_roles_cover', 'roles', 'Role_ID, Standard_Role'),
+    ('idx_projects_code', 'projects', 'Billing_Code'),
+    ('idx_billing_emp', 'billing', 'Employee_ID'),
+    ('idx_billing_cover', 'billing', 'Billing_Code, Employee_ID, Hours_Billed'),
+    ('idx_resume_emp', 'resume_data', 'Employee_ID'),
+    ('idx_deliverables_code', 'deliverables', 'Billing_Code'),
+]
+
+
+# Years of experience as written in resumes, e.g. "8y Python engineer"
+YEARS_PATTERN = re.compile(r'(\d+)y')
+
+
+def as_categories(df: pd.DataFrame) -> pd.DataFrame:
+    """Dictionary-encode the CATEGORY_COLUMNS present in df"""
+    cols = [col for col in CATEGORY_COLUMNS if col in df.columns]
+    if cols:
+        df = df.astype({col: 'category' for col in cols})
+    return df
+
+
+def plain_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """Undo as_categories, giving the pyarrow-backed strings a SQLite query would return"""
+    cols = df.select_dtypes(include='category').columns
+    if len(cols) > 0:
+        df = df.astype({col: pd.StringDtype("pyarrow") for col in cols})
+    return df
+
+
+def category_contains(values: pd.Series, text: str) -> np.ndarray:
+    """Row mask for a categorical column whose value contains text (case-insensitive)"""
+    categories = values.cat.categories.astype('string[pyarrow]')
+    matched = np.flatnonzero(categories.str.contains(text, case=False, regex=False).to_numpy(dtype=bool))
+    return np.isin(values.cat.codes.to_numpy(), matched)
+
+
+def join_distinct(keys: pd.Series, values: pd.Series) -> pd.Series:
+    """
+    Comma-joined distinct values of a categorical column per key, in first-seen order
+    (what SQLite's GROUP_CONCAT(DISTINCT ...) gives); keys without a value are left out
+    """
+    pairs = pd.DataFrame({'key': keys.to_numpy(), 'code': values.cat.codes.to_numpy()})
+    pairs = pairs[pairs['code'].to_numpy() >= 0].drop_duplicates()
+    pairs = pairs.sort_values('key', kind='stable')
+    key_values = pairs['key'].to_numpy()
+    codes = pairs['code'].to_numpy()
+    
+    # Dedupe and group on the integer codes, then let Arrow do every string join in one call
+    starts = np.flatnonzero(np.r_[True, key_values[1:] != key_values[:-1]]) if len(key_values) else np.array([], dtype=int)
+    offsets = pa.array(np.r_[starts, len(codes)], pa.int32())
+    strings = pa.array(values.cat.categories.astype(str), pa.string()).take(pa.array(codes))
+    joined = pc.binary_join(pa.ListArray.from_arrays(offsets, strings), ',')
+    return pd.Series(pd.arrays.ArrowStringArray(joined), index=pd.Index(key_values[starts], name=keys.name))
+
+
+# Parquet metadata key holding the "<size>:<mtime_ns>" of the CSV a snapshot was parsed from
+SNAPSHOT_SOURCE_KEY = b'workforce_source_csv'
+
+
+def source_stamp(path: Path) -> bytes:
+    """Size and nanosecond mtime of a CSV; any change (even to an older mtime) invalidates its snapshot"""
+    stat = path.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}".encode()
+
+
+def read_snapshot(snapshot: Path, stamp: bytes) -> Optional[pd.DataFrame]:
+    """
+    Read a Parquet snapshot, or None when it is missing, unreadable (e.g. truncated)
+    or was parsed from a CSV with a different stamp
+    """
+    try:
+        parquet = pq.ParquetFile(snapshot)
+        if (parquet.schema_arrow.metadata or {}).get(SNAPSHOT_SOURCE_KEY) != stamp:
+            return None
+        return parquet.read().to_pandas()
+    except (OSError, pa.ArrowException):
+        return None
+
+
+def write_snapshot(df: pd.DataFrame, snapshot: Path, stamp: bytes):
+    """
+    Write df as a zstd Parquet snapshot tagged with the source CSV stamp, via a temp
+    file in the same folder so an interrupted write never leaves a partial snapshot
+    at the final path
+    """
+    tmp = None
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), SNAPSHOT_SOURCE_KEY: stamp})
+        snapshot.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=snapshot.parent, suffix='.parquet.tmp')
+        os.close(fd)
+        pq.write_table(table, tmp, compression='zstd')
+        os.replace(tmp, snapshot)
+    except (OSError, pa.ArrowException):
+        # Read-only data folder or an unwritable frame: keep parsing the CSV each time
+        if tmp:
+            Path(tmp).unlink(missing_ok=True)
+
+
+def read_table(path: Path, cache_dir: Optional[Path] = None) -> pd.DataFrame:
+    """
+    Parse a CSV with the multithreaded pyarrow reader, then apply the text/category dtypes
+    
+    With a cache_dir the parsed CSV is snapshotted there as zstd Parquet, and later loads
+    read the snapshot instead while the CSV's size and mtime still match the snapshot's
+    """
+    snapshot = cache_dir / f"{path.stem}.parquet" if cache_dir else None
+    # Stamp before parsing, so a CSV rewritten mid-read leaves a snapshot that no longer matches
+    stamp = source_stamp(path) if snapshot else None
+    df = read_snapshot(snapshot, stamp) if snapshot else None
+    
+    if df is None:
+        df = pd.read_csv(path, engine='pyarrow')
+        if snapshot:
+            write_snapshot(df, snapshot, stamp)
+    
+    return as_categories(arrow_strings(df))
+
+
 class WorkforceDatabase:
     """Main database class for managing workforce data with proper relationships"""
     
     def __init__(self, data_folder: str = "Data"):
         """Initialize database with data folder path"""
         self.data_folder = Path(data_folder)
-        self.conn = sqlite3.connect(':memory:', check_same_thread=False)
+        # Parquet snapshots of the parsed CSVs (see read_table)
+        self.cache_dir = self.data_folder / ".cache"
+        # sqlite3 reuses a prepared statement whenever the same SQL text runs again; the
+        # filter combinations plus the IN (...) lists of various lengths outgrow the default 128
+        self.conn = sqlite3.connect(':memory:', check_same_thread=False, cached_statements=512)
+        # Keep GROUP BY/ORDER BY sorters and temp B-trees in RAM (64 MB page cache) instead of temp files
+        self.conn.executescript("PRAGMA temp_store=MEMORY; PRAGMA cache_size=-65536;")
         
         # DataFrames for each table
         self.employees_df = None
+        self.skill_index = {}
+        self.location_lower = None
+        self.employee_summary = None
+        self.analytics = {}
+        self.unfiltered = {}
+        self.column_dtypes = {}
+        
+        # New on every (re)load, across all instances, so cached query results can key on it
+        self.version = None
         self.projects_df = None
         self.billing_df = None
         self.resume_df = None
@@ -37,38 +203,132 @@ class WorkforceDatabase:
     def load_all_data(self):
         """Load all CSV files into pandas DataFrames and SQLite with relationships"""
         
-        # Load employees (primary key: Employee_ID, foreign key: Role_ID)
-        employees_file = self.data_folder / "EmployeeID-Name-Email-RoleID-JobTitle-Location-Skills-LinkedInURL.csv"
-        self.employees_df = pd.read_csv(employees_file)
-        self.employees_df.to_sql('employees', self.conn, if_exists='replace', index=False)
-        
-        # Load roles (primary key: Role_ID)
-        roles_file = self.data_folder / "RoleID-StandardRole-RoleTitleVariants.csv"
-        self.roles_df = pd.read_csv(roles_file)
-        self.roles_df.to_sql('roles', self.conn, if_exists='replace', index=False)
-        
-        # Load projects (primary key: Billing_Code)
-        projects_file = self.data_folder / "BillingCode-ProjectName-Client-Industry-Technologies-DollarAmount-ProjectScope.csv"
-        self.projects_df = pd.read_csv(projects_file)
-        self.projects_df.to_sql('projects', self.conn, if_exists='replace', index=False)
-        
-        # Load billing (foreign keys: Billing_Code, Employee_ID)
-        billing_file = self.data_folder / "BillingCode-EmployeeID-Year-HoursBilled-RoleinProject.csv"
-        self.billing_df = pd.read_csv(billing_file)
-        self.billing_df.to_sql('billing', self.conn, if_exists='replace', index=False)
-        
-        # Load resume data (foreign key: Employee_ID)
-        resume_file = self.data_folder / "EmployeeID-Education-Experience-Certifications-Summary.csv"
-        self.resume_df = pd.read_csv(resume_file)
-        self.resume_df.to_sql('resume_data', self.conn, if_exists='replace', index=False)
-        
-        # Load deliverables (foreign key: Billing_Code)
-        deliverables_file = self.data_folder / "BillingCode-Deliverable-DateCompleted-TopicArea-Technologies-Client-Codebase.csv"
-        self.deliverables_df = pd.read_csv(deliverables_file)
-        self.deliverables_df.to_sql('deliverables', self.conn, if_exists='replace', index=False)
-        
+        files = {
+            # primary key: Employee_ID, foreign key: Role_ID
+            'employees': "EmployeeID-Name-Email-RoleID-JobTitle-Location-Skills-LinkedInURL.csv",
+            # primary key: Role_ID
+            'roles': "RoleID-StandardRole-RoleTitleVariants.csv",
+            # primary key: Billing_Code
+            'projects': "BillingCode-ProjectName-Client-Industry-Technologies-DollarAmount-ProjectScope.csv",
+            # foreign keys: Billing_Code, Employee_ID
+            'billing': "BillingCode-EmployeeID-Year-HoursBilled-RoleinProject.csv",
+            # foreign key: Employee_ID
+            'resume_data': "EmployeeID-Education-Experience-Certifications-Summary.csv",
+            # foreign key: Billing_Code
+            'deliverables': "BillingCode-Deliverable-DateCompleted-TopicArea-Technologies-Client-Codebase.csv"
+        }
+        
+        # The CSVs are independent, so parse them in parallel (the pyarrow reader releases the GIL)
+        with ThreadPoolExecutor(max_workers=len(files)) as pool:
+            futures = {table: pool.submit(read_table, self.data_folder / name, self.cache_dir)
+                       for table, name in files.items()}
+            frames = {table: future.result() for table, future in futures.items()}
+        
+        # SQLite writes are serialized anyway, so copy the tables in one at a time
+        for table, df in frames.items():
+            df.to_sql(table, self.conn, if_exists='replace', index=False)
+        
+        self.employees_df = frames['employees']
+        self.roles_df = frames['roles']
+        self.projects_df = frames['projects']
+        self.billing_df = frames['billing']
+        self.resume_df = frames['resume_data']
+        self.deliverables_df = frames['deliverables']
+        
+        # dtype each column name has when SQLite returns it (categories come back as text)
+        self.column_dtypes = {col: dtype for df in frames.values()
+                              for col, dtype in plain_strings(df.iloc[:0]).dtypes.items()}
+        
+        self.skill_index = self.build_skill_index(self.employees_df)
+        self.location_lower = pd.Series(
+            self.employees_df['Location'].astype('string[pyarrow]').str.lower().values,
+            index=self.employees_df['Employee_ID']
+        )
+        
+        # Index the join keys (to_sql creates bare tables)
+        self.create_indexes()
+        
+        # Per-employee clients/industries/hours, reused by unfiltered complex searches
+        self.employee_summary = self._employee_summary()
+        
+        # No-filter directory/billing/resume joins, served straight from the DataFrames
+        self.unfiltered = {
+            'directory': self._directory_frame(),
+            'billing': self._billing_frame(),
+            'resume': self._resume_frame()
+        }
+        
+        # Analytics aggregates only change when the data is reloaded
+        self.analytics = {
+            'industry': self._analytics_by_industry(),
+            'skill': self._analytics_by_skill(),
+            'role': self._analytics_by_role()
+        }
+        
+        self.version = next(LOAD_VERSIONS)
         print("✓ All data loaded successfully with relationships established")
     
+    def create_indexes(self):
+        """Create the SQLITE_INDEXES and refresh planner statistics"""
+        with self.conn:
+            for name, table, columns in SQLITE_INDEXES:
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})")
+        self.conn.execute("ANALYZE")
+    
+    @staticmethod
+    def build_skill_index(employees_df: pd.DataFrame) -> Dict[str, frozenset]:
+        """Inverted index: individual skill -> set of Employee_IDs listing it"""
+        tokens = employees_df[['Employee_ID', 'Skills']].dropna(subset=['Skills'])
+        tokens = tokens.assign(Skills=tokens['Skills'].astype(str).str.split(';')).explode('Skills')
+        tokens['Skills'] = tokens['Skills'].str.strip().astype('category')
+        return {skill: frozenset(ids) for skill, ids in tokens.groupby('Skills', observed=True)['Employee_ID']}
+    
+    def employees_with_skills(self, skills: List[str]) -> set:
+        """
+        Employee_IDs having any of the given skills (case-insensitive substring match,
+        so "CV" also matches "OpenCV"). Scans the distinct skills, not every employee.
+        """
+        if not skills:
+            return set()
+        
+        # One alternation pass per indexed skill instead of a substring test per needle
+        pattern = re.compile('|'.join(re.escape(skill.lower()) for skill in skills))
+        ids = set()
+        for skill, emp_ids in self.skill_index.items():
+            if pattern.search(skill.lower()):
+                ids.update(emp_ids)
+        return ids
+    
+    def employees_in_location(self, location: str) -> set:
+        """Employee_IDs whose location contains the given text (case-insensitive)"""
+        matches = self.location_lower.str.contains(location.lower(), regex=False, na=False)
+        return set(self.location_lower.index[matches.to_numpy(dtype=bool)])
+    
+    def _read_sql(self, query: str, params: Optional[list] = None) -> pd.DataFrame:
+        """
+        Run a SELECT and return the result with pyarrow-backed text columns.
+        Rows are transposed straight into Arrow arrays, so text never passes
+        through object columns on its way to string[pyarrow].
+        """
+        cursor = self.conn.execute(query, params or [])
+        columns = [col[0] for col in cursor.description]
+        rows = cursor.fetchall()
+        
+        # No rows to infer from: type each column like the table column of the same name
+        # (object for computed columns), instead of letting every column become text
+        if not rows:
+            empty = pd.DataFrame({i: pd.Series(dtype=self.column_dtypes.get(col, object))
+                                  for i, col in enumerate(columns)})
+            empty.columns = columns
+            return empty
+        
+        try:
+            table = pa.table([pa.array(values) for values in zip(*rows)], names=columns)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # SQLite columns can mix types (e.g. text and integers); let pandas infer those
+            return arrow_strings(pd.DataFrame.from_records(rows, columns=columns, coerce_float=True))
+        return arrow_strings(table.to_pandas(types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get))
+    
     def get_employee_directory(self, 
                               skills: Optional[List[str]] = None,
                               role: Optional[str] = None,
@@ -78,6 +338,10 @@ class WorkforceDatabase:
         Get filtered employee directory with role information
         Uses relationship: employees.Role_ID -> roles.Role_ID
         """
+        # Unfiltered: the join was done in pandas at load, skip the SQLite round trip
+        if not (skills or role or location or title):
+            return self.unfiltered['directory'].copy()
+        
         query = """
         SELECT 
             e.Employee_ID,
@@ -99,20 +363,18 @@ class WorkforceDatabase:
             query += " AND r.Standard_Role LIKE ?"
             params.append(f"%{role}%")
         
-        if location:
-            query += " AND e.Location LIKE ?"
-            params.append(f"%{location}%")
-        
         if title:
             query += " AND e.Job_Title LIKE ?"
             params.append(f"%{title}%")
         
-        df = pd.read_sql_query(query, self.conn, params=params)
+        df = self._read_sql(query, params)
         
-        # Filter by skills if provided
+        # Filter by skills and location against the lowercased lookups built at load
         if skills:
-            mask = df['Skills'].apply(lambda x: any(skill.lower() in str(x).lower() for skill in skills))
-            df = df[mask]
+            df = df[df['Employee_ID'].isin(self.employees_with_skills(skills))]
+        
+        if location:
+            df = df[df['Employee_ID'].isin(self.employees_in_location(location))]
         
         return df
     
@@ -142,14 +404,12 @@ class WorkforceDatabase:
             query += " AND Dollar_Amount <= ?"
             params.append(max_amount)
         
-        df = pd.read_sql_query(query, self.conn, params=params)
-        
-        # Filter by technology if provided
+        # LIKE is case-insensitive for ASCII, matching the old lowercase substring test
         if technology:
-            mask = df['Technologies'].apply(lambda x: technology.lower() in str(x).lower())
-            df = df[mask]
+            query += " AND Technologies LIKE ?"
+            params.append(f"%{technology}%")
         
-        return df
+        return self._read_sql(query, params)
     
     def get_billing_by_employee(self, employee_id: Optional[int] = None) -> pd.DataFrame:
         """
@@ -157,6 +417,10 @@ class WorkforceDatabase:
         Uses relationships: billing.Employee_ID -> employees.Employee_ID
                           billing.Billing_Code -> projects.Billing_Code
         """
+        # Unfiltered: the join was done in pandas at load, skip the SQLite round trip
+        if not employee_id:
+            return self.unfiltered['billing'].copy()
+        
         query = """
         SELECT 
             b.Employee_ID,
@@ -180,7 +444,7 @@ class WorkforceDatabase:
         
         query += " ORDER BY b.Year DESC, b.Hours_Billed DESC"
         
-        return pd.read_sql_query(query, self.conn, params=params)
+        return self._read_sql(query, params)
     
     def get_billing_by_project(self, billing_code: Optional[str] = None) -> pd.DataFrame:
         """
@@ -212,7 +476,7 @@ class WorkforceDatabase:
         
         query += " ORDER BY b.Hours_Billed DESC"
         
-        return pd.read_sql_query(query, self.conn, params=params)
+        return self._read_sql(query, params)
     
     def get_billing_by_year(self, year: Optional[int] = None) -> pd.DataFrame:
         """Get billing summary by year"""
@@ -237,36 +501,26 @@ class WorkforceDatabase:
         query += " GROUP BY b.Year, p.Client, p.Industry, p.Project_Name"
         query += " ORDER BY b.Year DESC, Total_Hours DESC"
         
-        return pd.read_sql_query(query, self.conn, params=params)
+        return self._read_sql(query, params)
     
     def get_resume_matrix(self, employee_id: Optional[int] = None) -> pd.DataFrame:
         """
         Get resume and skills matrix for employees
         Uses relationship: resume_data.Employee_ID -> employees.Employee_ID
         """
-        query = """
-        SELECT 
-            e.Employee_ID,
-            e.Name,
-            e.Job_Title,
-            e.Location,
-            e.Skills,
-            r.Education,
-            r.Experience,
-            r.Certifications,
-            r.Summary,
-            e.LinkedIn_URL
-        FROM employees e
-        LEFT JOIN resume_data r ON e.Employee_ID = r.Employee_ID
-        WHERE 1=1
+        return self.get_resume_matrix_bulk([employee_id] if employee_id else None)
+    
+    def get_resume_matrix_bulk(self, employee_ids: Optional[List[int]] = None) -> pd.DataFrame:
         """
+        Resume and skills matrix rows for several employees in one query
+        (one row per Employee_ID; None returns every employee)
+        """
+        # Served from the employees/resume join built at load, no SQLite round trip
+        resumes = self.unfiltered['resume']
+        if employee_ids is None:
+            return resumes.copy()
         
-        params = []
-        if employee_id:
-            query += " AND e.Employee_ID = ?"
-            params.append(employee_id)
-        
-        return pd.read_sql_query(query, self.conn, params=params)
+        return resumes[resumes['Employee_ID'].isin(employee_ids).to_numpy()].reset_index(drop=True)
     
     def get_deliverables_tracker(self,
                                 billing_code: Optional[str] = None,
@@ -308,16 +562,50 @@ class WorkforceDatabase:
             query += " AND d.Client LIKE ?"
             params.append(f"%{client}%")
         
-        df = pd.read_sql_query(query, self.conn, params=params)
-        
-        # Filter by technology if provided
         if technology:
-            mask = df['Technologies'].apply(lambda x: technology.lower() in str(x).lower())
-            df = df[mask]
+            query += " AND d.Technologies LIKE ?"
+            params.append(f"%{technology}%")
         
-        return df
+        return self._read_sql(query, params)
+    
+    def _directory_frame(self) -> pd.DataFrame:
+        """Every employee with its standard role (unfiltered get_employee_directory)"""
+        directory = self.employees_df.merge(self.roles_df[['Role_ID', 'Standard_Role']],
+                                            on='Role_ID', how='left')
+        return plain_strings(directory[['Employee_ID', 'Name', 'Email', 'Job_Title', 'Location',
+                                        'Skills', 'Standard_Role', 'LinkedIn_URL']])
+    
+    def _billing_frame(self) -> pd.DataFrame:
+        """Every billing row with employee and project names (unfiltered get_billing_by_employee)"""
+        billing = (self.billing_df
+                   .merge(self.employees_df[['Employee_ID', 'Name']], on='Employee_ID', how='left')
+                   .merge(self.projects_df[['Billing_Code', 'Project_Name', 'Client']], on='Billing_Code', how='left'))
+        # Stable sort keeps the billing-table order for ties, like SQLite's ORDER BY
+        billing = billing.sort_values(['Year', 'Hours_Billed'], ascending=False, kind='stable', ignore_index=True)
+        return plain_strings(billing[['Employee_ID', 'Name', 'Billing_Code', 'Project_Name', 'Client',
+                                      'Year', 'Hours_Billed', 'Role_in_Project']])
+    
+    def _resume_frame(self) -> pd.DataFrame:
+        """Every employee with their resume fields (get_resume_matrix_bulk)"""
+        resumes = self.employees_df.merge(
+            self.resume_df[['Employee_ID', 'Education', 'Experience', 'Certifications', 'Summary']],
+            on='Employee_ID', how='left')
+        return plain_strings(resumes[['Employee_ID', 'Name', 'Job_Title', 'Location', 'Skills', 'Education',
+                                      'Experience', 'Certifications', 'Summary', 'LinkedIn_URL']])
     
     def get_analytics_by_industry(self) -> pd.DataFrame:
+        """Total billed hours by industry and client (precomputed at load)"""
+        return self.analytics['industry'].copy()
+    
+    def get_analytics_by_skill(self) -> pd.DataFrame:
+        """Count of staff distribution by skill (precomputed at load)"""
+        return self.analytics['skill'].copy()
+    
+    def get_analytics_by_role(self) -> pd.DataFrame:
+        """Count of staff distribution by role (precomputed at load)"""
+        return self.analytics['role'].copy()
+    
+    def _analytics_by_industry(self) -> pd.DataFrame:
         """
         Aggregate total billed hours by industry and client
         Uses relationship: billing.Billing_Code -> projects.Billing_Code
@@ -336,27 +624,17 @@ class WorkforceDatabase:
         ORDER BY Total_Hours DESC
         """
         
-        return pd.read_sql_query(query, self.conn)
+        return self._read_sql(query)
     
-    def get_analytics_by_skill(self) -> pd.DataFrame:
+    def _analytics_by_skill(self) -> pd.DataFrame:
         """Count of staff distribution by skill"""
-        # Parse skills from employees
-        skills_data = []
-        for _, row in self.employees_df.iterrows():
-            if pd.notna(row['Skills']):
-                skills = [s.strip() for s in str(row['Skills']).split(';')]
-                for skill in skills:
-                    skills_data.append({
-                        'Skill': skill,
-                        'Employee_ID': row['Employee_ID'],
-                        'Name': row['Name'],
-                        'Location': row['Location']
-                    })
-        
-        skills_df = pd.DataFrame(skills_data)
+        # One row per (employee, skill) pair
+        skills_df = self.employees_df[['Employee_ID', 'Location', 'Skills']].dropna(subset=['Skills'])
+        skills_df = skills_df.assign(Skill=skills_df['Skills'].astype(str).str.split(';')).explode('Skill')
+        skills_df['Skill'] = skills_df['Skill'].str.strip()
         
         # Aggregate by skill
-        summary = skills_df.groupby('Skill').agg({
+        summary = skills_df.groupby('Skill', observed=True).agg({
             'Employee_ID': 'count',
             'Location': lambda x: ', '.join(sorted(set(x)))
         }).reset_index()
@@ -366,7 +644,7 @@ class WorkforceDatabase:
         
         return summary
     
-    def get_analytics_by_role(self) -> pd.DataFrame:
+    def _analytics_by_role(self) -> pd.DataFrame:
         """
         Count of staff distribution by role
         Uses relationship: employees.Role_ID -> roles.Role_ID
@@ -382,7 +660,7 @@ class WorkforceDatabase:
         ORDER BY Employee_Count DESC
         """
         
-        return pd.read_sql_query(query, self.conn)
+        return self._read_sql(query)
     
     def complex_search(self,
                       skills: Optional[List[str]] = None,
@@ -400,8 +678,52 @@ class WorkforceDatabase:
         - employees.Role_ID -> roles.Role_ID
         - employees.Employee_ID -> resume_data.Employee_ID
         """
+        # Narrow the employees with the cheap single-table filters first, so the
+        # billing/projects join below only runs for the surviving candidates
+        employees = self.employees_df
+        masks = []
+        
+        if skills:
+            masks.append(employees['Employee_ID'].isin(self.employees_with_skills(skills)).to_numpy())
+        
+        if location:
+            masks.append(employees['Employee_ID'].isin(self.employees_in_location(location)).to_numpy())
+        
+        if role:
+            roles = self.roles_df['Standard_Role'].astype('string[pyarrow]')
+            role_ids = self.roles_df.loc[roles.str.contains(role, case=False, regex=False, na=False).to_numpy(dtype=bool), 'Role_ID']
+            masks.append(employees['Role_ID'].isin(role_ids).to_numpy())
+        
+        if min_years_exp:
+            # Total of every "<n>y" mention in the experience text (0 when there are none)
+            years = (self.resume_df['Experience'].str.extractall(YEARS_PATTERN)[0].astype(int)
+                     .groupby(level=0).sum().reindex(self.resume_df.index, fill_value=0))
+            experienced = self.resume_df.loc[(years >= min_years_exp).to_numpy(dtype=bool), 'Employee_ID']
+            masks.append(employees['Employee_ID'].isin(experienced).to_numpy())
+        
+        # None (no employee filter) lets the project query below run without an IN (...) list
+        candidate_ids = (employees['Employee_ID'].to_numpy()[np.logical_and.reduce(masks)].tolist()
+                         if masks else None)
+        
+        # Without project filters the per-employee aggregates are the ones precomputed at load
+        if not client_experience and not industry_experience:
+            summary = self.employee_summary
+            if candidate_ids is None:
+                return summary.copy()
+            return summary[summary['Employee_ID'].isin(candidate_ids)].reset_index(drop=True)
+        
+        return self._employee_summary(candidate_ids, client_experience, industry_experience)
+    
+    def _employee_summary(self, employee_ids: Optional[List[int]] = None,
+                          client_experience: Optional[str] = None,
+                          industry_experience: Optional[str] = None) -> pd.DataFrame:
+        """
+        One row per employee with role, resume fields and the clients, industries and
+        hours from their billed projects (only projects matching the client/industry
+        filters count when those are given)
+        """
         query = """
-        SELECT DISTINCT
+        SELECT
             e.Employee_ID,
             e.Name,
             e.Email,
@@ -411,85 +733,124 @@ class WorkforceDatabase:
             r.Standard_Role,
             rd.Education,
             rd.Experience,
-            rd.Certifications,
-            GROUP_CONCAT(DISTINCT p.Client) as Clients_Worked,
-            GROUP_CONCAT(DISTINCT p.Industry) as Industries_Worked,
-            SUM(b.Hours_Billed) as Total_Hours_Billed
+            rd.Certifications
         FROM employees e
         LEFT JOIN roles r ON e.Role_ID = r.Role_ID
         LEFT JOIN resume_data rd ON e.Employee_ID = rd.Employee_ID
-        LEFT JOIN billing b ON e.Employee_ID = b.Employee_ID
-        LEFT JOIN projects p ON b.Billing_Code = p.Billing_Code
         WHERE 1=1
         """
-        
         params = []
         
-        if role:
-            query += " AND r.Standard_Role LIKE ?"
-            params.append(f"%{role}%")
+        if employee_ids is not None:
+            placeholders = ', '.join('?' * len(employee_ids))
+            query += f" AND e.Employee_ID IN ({placeholders})"
+            params.extend(employee_ids)
         
-        if location:
-            query += " AND e.Location LIKE ?"
-            params.append(f"%{location}%")
+        query += " ORDER BY e.Employee_ID"
+        employees = self._read_sql(query, params)
         
-        if client_experience:
-            query += " AND p.Client LIKE ?"
-            params.append(f"%{client_experience}%")
+        history = self._billed_history(employee_ids, client_experience, industry_experience)
+        # With project filters an employee needs at least one matching project
+        how = 'inner' if client_experience or industry_experience else 'left'
         
-        if industry_experience:
-            query += " AND p.Industry LIKE ?"
-            params.append(f"%{industry_experience}%")
+        summary = employees.merge(history, on='Employee_ID', how=how)
+        # An empty inner merge moves the key after the left columns; keep the usual order
+        return summary[[*employees.columns, *history.columns.drop('Employee_ID')]]
+    
+    def _billed_history(self, employee_ids: Optional[List[int]] = None,
+                        client_experience: Optional[str] = None,
+                        industry_experience: Optional[str] = None) -> pd.DataFrame:
+        """
+        Distinct clients and industries (in billing order) and total hours per employee,
+        aggregated on the category codes rather than with GROUP_CONCAT(DISTINCT ...)
+        Uses relationship: billing.Billing_Code -> projects.Billing_Code
+        """
+        billing = self.billing_df[['Employee_ID', 'Billing_Code', 'Hours_Billed']]
+        if employee_ids is not None:
+            billing = billing[billing['Employee_ID'].isin(employee_ids).to_numpy()]
         
-        query += " GROUP BY e.Employee_ID, e.Name, e.Email, e.Job_Title, e.Location, e.Skills, r.Standard_Role, rd.Education, rd.Experience, rd.Certifications"
+        history = billing.merge(self.projects_df[['Billing_Code', 'Client', 'Industry']],
+                                on='Billing_Code', how='left')
         
-        df = pd.read_sql_query(query, self.conn, params=params)
+        # Client/Industry stay categorical: the filters test each category once, then keep rows by code
+        if client_experience:
+            history = history[category_contains(history['Client'], client_experience)]
         
-        # Filter by skills if provided
-        if skills:
-            mask = df['Skills'].apply(lambda x: any(skill.lower() in str(x).lower() for skill in skills))
-            df = df[mask]
+        if industry_experience:
+            history = history[category_contains(history['Industry'], industry_experience)]
         
-        # Filter by years of experience if provided
-        if min_years_exp:
-            def extract_years(exp_str):
-                if pd.isna(exp_str):
-                    return 0
-                matches = re.findall(r'(\d+)y', str(exp_str))
-                return sum(int(m) for m in matches) if matches else 0
-            
-            mask = df['Experience'].apply(lambda x: extract_years(x) >= min_years_exp)
-            df = df[mask]
+        hours = history.groupby('Employee_ID')['Hours_Billed'].sum()
+        summary = pd.DataFrame({
+            'Clients_Worked': join_distinct(history['Employee_ID'], history['Client']).reindex(hours.index),
+            'Industries_Worked': join_distinct(history['Employee_ID'], history['Industry']).reindex(hours.index),
+            'Total_Hours_Billed': hours
+        })
         
-        return df
+        return summary.reset_index()
     
-    def get_employee_project_history(self, employee_id: int) -> pd.DataFrame:
+    def get_employee_project_history(self, employee_id: int,
+                                     include_deliverables: bool = True) -> pd.DataFrame:
         """
         Get complete project history for an employee
         Uses relationships: employees -> billing -> projects, deliverables
+        
+        With include_deliverables=False the deliverables join is skipped, giving
+        one row per billing record instead of one per deliverable
         """
-        query = """
-        SELECT 
-            e.Name,
-            e.Job_Title,
-            p.Project_Name,
-            p.Client,
-            p.Industry,
-            p.Technologies,
-            b.Year,
-            b.Hours_Billed,
-            b.Role_in_Project,
-            d.Deliverable,
-            d.Date_Completed
-        FROM employees e
-        LEFT JOIN billing b ON e.Employee_ID = b.Employee_ID
-        LEFT JOIN projects p ON b.Billing_Code = p.Billing_Code
-        LEFT JOIN deliverables d ON b.Billing_Code = d.Billing_Code
-        WHERE e.Employee_ID = ?
-        ORDER BY b.Year DESC, b.Hours_Billed DESC
+        history = self.get_employee_project_history_bulk([employee_id], include_deliverables)
+        return history.drop(columns='Employee_ID')
+    
+    def get_employee_project_history_bulk(self, employee_ids: List[int],
+                                          include_deliverables: bool = True) -> pd.DataFrame:
         """
-        
-        return pd.read_sql_query(query, self.conn, params=[employee_id])
+        Project history for several employees in one query, with an Employee_ID
+        column to split on (each employee's rows keep the single-employee order)
+        """
+        placeholders = ', '.join('?' * len(employee_ids))
+        
+        if include_deliverables:
+            query = f"""
+            SELECT 
+                e.Employee_ID,
+                e.Name,
+                e.Job_Title,
+                p.Project_Name,
+                p.Client,
+                p.Industry,
+                p.Technologies,
+                b.Year,
+                b.Hours_Billed,
+                b.Role_in_Project,
+                d.Deliverable,
+                d.Date_Completed
+            FROM employees e
+            LEFT JOIN billing b ON e.Employee_ID = b.Employee_ID
+            LEFT JOIN projects p ON b.Billing_Code = p.Billing_Code
+            LEFT JOIN deliverables d ON b.Billing_Code = d.Billing_Code
+            WHERE e.Employee_ID IN ({placeholders})
+            ORDER BY e.Employee_ID, b.Year DESC, b.Hours_Billed DESC
+            """
+        else:
+            query = f"""
+            SELECT DISTINCT
+                e.Employee_ID,
+                e.Name,
+                e.Job_Title,
+                p.Project_Name,
+                p.Client,
+                p.Industry,
+                p.Technologies,
+                b.Year,
+                b.Hours_Billed,
+                b.Role_in_Project
+            FROM employees e
+            LEFT JOIN billing b ON e.Employee_ID = b.Employee_ID
+            LEFT JOIN projects p ON b.Billing_Code = p.Billing_Code
+            WHERE e.Employee_ID IN ({placeholders})
+            ORDER BY e.Employee_ID, b.Year DESC, b.Hours_Billed DESC
+            """
+        
+        return self._read_sql(query, list(employee_ids))
     
     def close(self):
         """Close database connection"""
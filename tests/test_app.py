@@ -0,0 +1,54 @@
+"""
+AppTest checks for the Streamlit app
+Run with: pytest
+"""
+
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+REPO = Path(__file__).resolve().parent.parent
+EMPLOYEES_CSV = "EmployeeID-Name-Email-RoleID-JobTitle-Location-Skills-LinkedInURL.csv"
+SKILLS_MATRIX_COLUMNS = ['Name', 'Python', 'CV', 'OpenCV', 'TensorFlow', 'AWS', 'Leadership']
+
+
+@pytest.fixture
+def texas_data(tmp_path, monkeypatch):
+    """
+    Run the app against a copy of Data/ with "TX" spelled out as "Texas", so the
+    demo RFI's location="Texas" search returns candidates
+    """
+    shutil.copytree(REPO / "Data", tmp_path / "Data")
+    shutil.copytree(REPO / "assets", tmp_path / "assets")
+    employees_file = tmp_path / "Data" / EMPLOYEES_CSV
+    employees = pd.read_csv(employees_file)
+    employees['Location'] = employees['Location'].str.replace(r'\bTX\b', 'Texas', regex=True)
+    employees.to_csv(employees_file, index=False)
+    monkeypatch.chdir(tmp_path)
+
+
+def skills_matrices(at):
+    """Rendered dataframes shaped like the Skills Coverage matrix"""
+    return [df.value for df in at.dataframe if list(df.value.columns) == SKILLS_MATRIX_COLUMNS]
+
+
+def test_skills_matrix_renders_after_loading_sample_rfi(texas_data):
+    at = AppTest.from_file(str(REPO / "app.py"), default_timeout=120).run()
+    at.sidebar.radio[0].set_value("AI Staffing Matrix").run()
+
+    next(b for b in at.button if b.label.startswith("Load Texas Police RFI")).click().run()
+    assert not at.exception
+    assert not skills_matrices(at)
+
+    # Ticking the checkbox reruns the script without the button click; the results must stay
+    at.checkbox(key='show_skills').check().run()
+    assert not at.exception
+    assert "Step 4: Recommended Staffing Matrix" in [header.value for header in at.subheader]
+
+    matrices = skills_matrices(at)
+    assert len(matrices) == 1
+    assert len(matrices[0]) > 0
+    assert set(matrices[0]['Python']) <= {'Yes', 'No'}